@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from typing import Dict, List
+
+from src.conceptnet_client import ConceptNetClient
+from src.conceptnet_standin import StandInConfig, serve
+
+
+def setup_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sequential vs async ConceptNet lookups against a local stand-in")
+    parser.add_argument('--words', type=int, default=1000,
+                        help='Number of words fetched by the async client')
+    parser.add_argument('--sequential-words', type=int, default=100,
+                        help='Number of words fetched by the sequential loop')
+    parser.add_argument('--port', type=int, default=8084)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--max-edges', type=int, default=1000)
+    return parser.parse_args()
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"Stand-in server did not start on port {port}")
+
+
+def run_sequential(words: List[str]) -> Dict[str, float]:
+    from src.conceptnet_utils import get_conceptnet_entries
+
+    edges = 0
+    failed = 0
+    start = time.perf_counter()
+    for word in words:
+        try:
+            edges += len(get_conceptnet_entries(word))
+        except Exception:
+            failed += 1
+    elapsed = time.perf_counter() - start
+    return {'words': len(words), 'edges': edges, 'failed': failed,
+            'requests': len(words), 'elapsed': elapsed}
+
+
+async def run_async(words: List[str], url: str, concurrency: int,
+                    max_edges: int) -> Dict[str, float]:
+    edges = 0
+    failed = 0
+    async with ConceptNetClient(url, concurrency=concurrency,
+                                max_edges=max_edges) as client:
+        start = time.perf_counter()
+        for result in asyncio.as_completed([client.get_edges(word) for word in words]):
+            entries = await result
+            if entries is None:
+                failed += 1
+            else:
+                edges += len(entries)
+        elapsed = time.perf_counter() - start
+    return {'words': len(words), 'edges': edges, 'failed': failed,
+            'requests': client.requests_sent, 'elapsed': elapsed}
+
+
+def report(name: str, metrics: Dict[str, float]) -> None:
+    logging.info(
+        f"{name}: {metrics['words'] / metrics['elapsed']:.1f} words/s, "
+        f"{metrics['edges'] / metrics['words']:.1f} edges/word, "
+        f"{metrics['requests']} requests, {metrics['failed']} failed, "
+        f"{metrics['elapsed']:.2f}s"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    setup_logging()
+
+    url = f'http://127.0.0.1:{args.port}'
+    os.environ['CONCEPTNET_URL'] = url
+    os.environ.pop('CONCEPTNET_INDEX', None)
+
+    config = StandInConfig(latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate)
+    context = multiprocessing.get_context('spawn')
+    server = context.Process(target=serve, args=(config, '127.0.0.1', args.port),
+                             daemon=True)
+    server.start()
+    try:
+        wait_for_port(args.port)
+        words = [f'word{i}' for i in range(args.words)]
+        report('sequential', run_sequential(words[:args.sequential_words]))
+        report('async', asyncio.run(run_async(words, url, args.concurrency,
+                                              args.max_edges)))
+    except KeyboardInterrupt:
+        logging.info("Exiting!")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
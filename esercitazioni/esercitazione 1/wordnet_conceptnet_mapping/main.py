@@ -1,9 +1,20 @@
+import argparse
+import asyncio
 import json
+import os
 import random
 import logging
+from typing import Dict, List
+
 import nltk
 from nltk.corpus import wordnet as wn
-from src.wordnet_utils import wordnet_to_conceptnet
+from lexical_tools import get_wordnet_index
+from src.batch import build_mapping
+from src.conceptnet_client import client_from_env
+from src.conceptnet_index import build_index
+from src.conceptnet_utils import get_local_index
+from src.graph_store import build_graph
+from src.wordnet_utils import WordNetToConceptNetResult, map_words, wordnet_to_conceptnet
 
 nltk_packages = ["wordnet"]
 for pkg in nltk_packages:
@@ -20,26 +31,103 @@ def setup_logging() -> None:
     )
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="WordNet to ConceptNet mapping")
+    parser.add_argument(
+        '--build-index',
+        metavar='DUMP',
+        help='Build a local index from a gzipped ConceptNet assertions CSV dump'
+    )
+    parser.add_argument(
+        '--index',
+        default=os.getenv("CONCEPTNET_INDEX"),
+        help='Directory of the local ConceptNet index to query instead of the API'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Map every WordNet lemma into sharded JSONL files with a process pool'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes used by --full'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='wordnet_to_conceptnet',
+        help='Directory of the JSONL shards written by --full'
+    )
+    parser.add_argument(
+        '--build-graph',
+        metavar='MAPPING',
+        help='Build the compact graph store from the --full shards or a sample JSON file'
+    )
+    parser.add_argument(
+        '--graph',
+        default='wordnet_conceptnet_graph',
+        help='Directory of the graph store written by --build-graph'
+    )
+    return parser.parse_args()
+
+
+def collect_words() -> List[str]:
+    index = get_wordnet_index()
+    if index is not None:
+        return list(index.words())
+
+    all_words = set()
+    logging.info("Collecting words from WordNet...")
+    for synset in wn.all_synsets():
+        for lemma in synset.lemmas():
+            all_words.add(lemma.name())
+    return list(all_words)
+
+
+async def process_words_async(words: List[str],
+                              results: Dict[str, WordNetToConceptNetResult]) -> None:
+    async with client_from_env() as client:
+        async for word, result in map_words(words, client):
+            if result is None:
+                logging.warning(f"Failed to process word '{word}'")
+                continue
+            results[word] = result
+            logging.info(f"Processed: {word}")
+
+
 def main() -> None:
+    args = parse_args()
     setup_logging()
 
+    if args.build_index:
+        build_index(args.build_index, args.index or "conceptnet_index")
+        return
+    if args.build_graph:
+        build_graph(args.build_graph, args.graph)
+        return
+    if args.index:
+        os.environ["CONCEPTNET_INDEX"] = args.index
+
+    results = {}
     try:
-        all_words = set()
-        logging.info("Collecting words from WordNet...")
-        for synset in wn.all_synsets():
-            for lemma in synset.lemmas():
-                all_words.add(lemma.name())
-        word_list = list(all_words)
+        word_list = collect_words()
+        if args.full:
+            build_mapping(word_list, args.output_dir, args.workers)
+            return
+
         random.shuffle(word_list)
         selected_words = word_list[:min(100, len(word_list))]
-        results = {}
         logging.info(f"Processing {len(selected_words)} random words...")
-        for word in sorted(selected_words):
-            try:
-                results[word] = wordnet_to_conceptnet(word)
-                logging.info(f"Processed: {word}")
-            except Exception as e:
-                logging.warning(f"Failed to process word '{word}': {e}")
+        if get_local_index() is None:
+            asyncio.run(process_words_async(selected_words, results))
+        else:
+            for word in sorted(selected_words):
+                try:
+                    results[word] = wordnet_to_conceptnet(word)
+                    logging.info(f"Processed: {word}")
+                except Exception as e:
+                    logging.warning(f"Failed to process word '{word}': {e}")
 
         with open("wordnet_to_conceptnet_sample.json", "w", encoding="utf-8") as f:
             json.dump(results, f, ensure_ascii=False, indent=2)
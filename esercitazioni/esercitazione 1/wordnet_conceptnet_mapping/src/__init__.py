@@ -1,2 +1,15 @@
-from src.conceptnet_utils import get_conceptnet_entries
-from src.wordnet_utils import wordnet_to_conceptnet
+from typing import Any
+import importlib
+
+# Resolved on first use, so src.graph_store and src.conceptnet_index
+# can be imported without nltk, requests or aiohttp
+_EXPORTS = {
+    "get_conceptnet_entries": "src.conceptnet_utils",
+    "wordnet_to_conceptnet": "src.wordnet_utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'src' has no attribute '{name}'")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
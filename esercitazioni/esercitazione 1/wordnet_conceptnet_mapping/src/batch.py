@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, TextIO, Tuple
+import asyncio
+import json
+import logging
+import os
+import time
+
+from src.conceptnet_client import client_from_env
+from src.conceptnet_utils import get_local_index
+from src.wordnet_utils import WordNetToConceptNetResult, map_words, wordnet_to_conceptnet
+
+
+def shard_path(output_dir: str, shard_id: int) -> str:
+    return os.path.join(output_dir, f"part-{shard_id:05d}.jsonl")
+
+
+def write_result(file: TextIO, word: str, result: WordNetToConceptNetResult) -> None:
+    file.write(json.dumps({"word": word, **result}, ensure_ascii=False) + "\n")
+    file.flush()
+
+
+async def process_shard_async(shard_id: int, words: List[str], output_dir: str
+                              ) -> Tuple[int, int, int]:
+    processed = 0
+    failed = 0
+    with open(shard_path(output_dir, shard_id), "w", encoding="utf-8") as file:
+        async with client_from_env() as client:
+            async for word, result in map_words(words, client):
+                if result is None:
+                    failed += 1
+                    continue
+                write_result(file, word, result)
+                processed += 1
+    return shard_id, processed, failed
+
+
+def process_shard(shard_id: int, words: List[str], output_dir: str
+                  ) -> Tuple[int, int, int]:
+    # Without a local index the shard is network bound, so it runs on the async client
+    if get_local_index() is None:
+        return asyncio.run(process_shard_async(shard_id, words, output_dir))
+
+    processed = 0
+    failed = 0
+    with open(shard_path(output_dir, shard_id), "w", encoding="utf-8") as file:
+        for word in words:
+            try:
+                result = wordnet_to_conceptnet(word)
+            except Exception as e:
+                logging.warning(f"Failed to process word '{word}': {e}")
+                result = None
+
+            if result is None:
+                failed += 1
+                continue
+
+            write_result(file, word, result)
+            processed += 1
+    return shard_id, processed, failed
+
+
+def build_mapping(words: List[str], output_dir: str, workers: int,
+                  shard_size: int = 1000) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    words = sorted(words)
+    shards = [words[i:i + shard_size] for i in range(0, len(words), shard_size)]
+    logging.info(f"Mapping {len(words)} words in {len(shards)} shards "
+                 f"with {workers} workers into '{output_dir}'")
+
+    start = time.perf_counter()
+    done_words = 0
+    processed = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_shard, shard_id, shard, output_dir): shard_id
+            for shard_id, shard in enumerate(shards)
+        }
+        for future in as_completed(futures):
+            shard_id = futures[future]
+            try:
+                _, shard_processed, shard_failed = future.result()
+            except Exception as e:
+                logging.error(f"Shard {shard_id} failed: {e}")
+                shard_processed, shard_failed = 0, len(shards[shard_id])
+
+            processed += shard_processed
+            failed += shard_failed
+            done_words += len(shards[shard_id])
+            elapsed = time.perf_counter() - start
+            rate = done_words / elapsed if elapsed else 0.0
+            remaining = (len(words) - done_words) / rate if rate else 0.0
+            logging.info(f"[{done_words}/{len(words)}] {rate:.1f} words/s, "
+                         f"ETA {remaining / 60:.1f} min")
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Mapped {processed} words ({failed} without results) in "
+                 f"{elapsed:.1f}s, {len(words) / elapsed if elapsed else 0.0:.1f} words/s, "
+                 f"{len(shards)} shard files in '{output_dir}'")
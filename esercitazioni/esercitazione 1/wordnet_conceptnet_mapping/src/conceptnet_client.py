@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+CONCEPTNET_URL = "http://api.conceptnet.io"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def conceptnet_url() -> str:
+    return os.getenv("CONCEPTNET_URL", CONCEPTNET_URL).rstrip("/")
+
+
+class ConceptNetClient:
+    def __init__(
+        self,
+        url: str = CONCEPTNET_URL,
+        concurrency: int = 8,
+        max_edges: int = 1000,
+        page_size: int = 1000,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0
+    ) -> None:
+        self.url = url.rstrip("/")
+        self.concurrency = concurrency
+        self.max_edges = max_edges
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.requests_sent = 0
+        self.retries = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'ConceptNetClient':
+        connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                         ttl_dns_cache=300,
+                                         keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, self.backoff)
+            except ValueError:
+                pass
+        ceiling = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def get_edges(self, word: str) -> Optional[List[Dict[str, Any]]]:
+        normalized_word = word.lower().replace(" ", "_")
+        limit = min(self.page_size, self.max_edges)
+        path: Optional[str] = f"/c/en/{normalized_word}?offset=0&limit={limit}"
+
+        edges: List[Dict[str, Any]] = []
+        while path and len(edges) < self.max_edges:
+            data = await self._fetch(word, path)
+            if data is None:
+                return None
+            if 'edges' not in data:
+                logging.error(f"Invalid ConceptNet response for '{word}': "
+                              f"missing 'edges' key")
+                return None
+            edges.extend(data['edges'])
+            path = data.get('view', {}).get('nextPage')
+
+        if path:
+            logging.debug(f"Truncated '{word}' at {self.max_edges} ConceptNet edges")
+        return edges[:self.max_edges]
+
+    async def _fetch(self, word: str, path: str) -> Optional[Dict[str, Any]]:
+        if self._session is None:
+            raise RuntimeError("ConceptNetClient must be used as an async context manager")
+
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                self.requests_sent += 1
+                retry_after = None
+                try:
+                    async with self._session.get(self.url + path) as response:
+                        if response.status in RETRY_STATUSES:
+                            retry_after = response.headers.get('Retry-After')
+                            reason = f"HTTP {response.status}"
+                        else:
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+                except aiohttp.ClientResponseError as e:
+                    logging.error(f"ConceptNet API request failed for '{word}': {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    reason = f"{type(e).__name__}: {e}"
+
+                if attempt == self.max_retries:
+                    logging.error(f"Giving up on '{word}' after "
+                                  f"{attempt + 1} attempts ({reason})")
+                    return None
+
+                delay = self._delay(attempt, retry_after)
+                self.retries += 1
+                logging.warning(f"Retrying '{word}' in {delay:.2f}s ({reason})")
+                await asyncio.sleep(delay)
+        return None
+
+
+def client_from_env() -> ConceptNetClient:
+    return ConceptNetClient(
+        url=conceptnet_url(),
+        concurrency=int(os.getenv("CONCEPTNET_CONCURRENCY", "8")),
+        max_edges=int(os.getenv("CONCEPTNET_MAX_EDGES", "1000")),
+        max_retries=int(os.getenv("CONCEPTNET_MAX_RETRIES", "5"))
+    )
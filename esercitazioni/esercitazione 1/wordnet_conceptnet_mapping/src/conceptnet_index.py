@@ -0,0 +1,165 @@
+from array import array
+from typing import Any, Dict, List, Optional
+import gzip
+import json
+import logging
+import os
+import re
+import time
+
+from lexical_tools.mapped import MappedColumns, write_column, write_strings
+
+INDEX_VERSION = 2
+WEIGHT_PATTERN = re.compile(r'"weight":\s*([0-9.eE+-]+)')
+
+# name -> array typecode of every column file in the index directory
+COLUMNS = {
+    "keys_offsets": "Q",
+    "postings_indptr": "Q",
+    "postings": "I",
+    "edge_rel": "H",
+    "edge_start": "I",
+    "edge_end": "I",
+    "edge_weight": "f",
+}
+
+
+def concept_key(uri: str) -> str:
+    return "/".join(uri.split("/")[:4])
+
+
+def word_key(word: str, lang: str = "en") -> str:
+    return f"/c/{lang}/{word.lower().replace(' ', '_')}"
+
+
+def concept_label(key: str) -> str:
+    return key.split("/")[3].replace("_", " ")
+
+
+def build_index(dump_path: str, index_dir: str, lang: str = "en") -> None:
+    start_time = time.perf_counter()
+    prefix = f"/c/{lang}/"
+
+    term_ids: Dict[str, int] = {}
+    relation_ids: Dict[str, int] = {}
+    edge_rel = array("H")
+    edge_start = array("I")
+    edge_end = array("I")
+    edge_weight = array("f")
+
+    with gzip.open(dump_path, "rt", encoding="utf-8") as dump:
+        for line_number, line in enumerate(dump, 1):
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            _, rel, start, end, info = fields[:5]
+            if not (start.startswith(prefix) and end.startswith(prefix)):
+                continue
+
+            weight = WEIGHT_PATTERN.search(info)
+            edge_rel.append(relation_ids.setdefault(rel, len(relation_ids)))
+            edge_start.append(term_ids.setdefault(concept_key(start), len(term_ids)))
+            edge_end.append(term_ids.setdefault(concept_key(end), len(term_ids)))
+            edge_weight.append(float(weight.group(1)) if weight else 1.0)
+
+            if line_number % 5_000_000 == 0:
+                logging.info(f"Read {line_number} assertions, "
+                             f"kept {len(edge_rel)} {lang} edges")
+
+    terms = sorted(term_ids)
+    rank = array("I", bytes(4 * len(terms)))
+    for position, term in enumerate(terms):
+        rank[term_ids[term]] = position
+    del term_ids
+
+    for column in (edge_start, edge_end):
+        for i, term_id in enumerate(column):
+            column[i] = rank[term_id]
+
+    # Counting sort of edge ids by the concepts they touch
+    counts = array("Q", bytes(8 * (len(terms) + 1)))
+    for i in range(len(edge_rel)):
+        counts[edge_start[i] + 1] += 1
+        if edge_end[i] != edge_start[i]:
+            counts[edge_end[i] + 1] += 1
+    for i in range(1, len(counts)):
+        counts[i] += counts[i - 1]
+    postings_indptr = array("Q", counts)
+    postings = array("I", bytes(4 * counts[-1]))
+    for i in range(len(edge_rel)):
+        postings[counts[edge_start[i]]] = i
+        counts[edge_start[i]] += 1
+        if edge_end[i] != edge_start[i]:
+            postings[counts[edge_end[i]]] = i
+            counts[edge_end[i]] += 1
+
+    os.makedirs(index_dir, exist_ok=True)
+    write_strings(index_dir, "keys", terms)
+    columns = {
+        "postings_indptr": postings_indptr,
+        "postings": postings,
+        "edge_rel": edge_rel,
+        "edge_start": edge_start,
+        "edge_end": edge_end,
+        "edge_weight": edge_weight,
+    }
+    for name, values in columns.items():
+        write_column(index_dir, name, values)
+
+    relations = sorted(relation_ids, key=relation_ids.__getitem__)
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump({
+            "version": INDEX_VERSION,
+            "language": lang,
+            "relations": relations,
+            "concepts": len(terms),
+            "edges": len(edge_rel),
+        }, file, indent=2)
+
+    logging.info(f"Indexed {len(edge_rel)} edges over {len(terms)} concepts in "
+                 f"{time.perf_counter() - start_time:.1f}s")
+
+
+class ConceptNetIndex:
+    def __init__(self, index_dir: str) -> None:
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported ConceptNet index version in '{index_dir}'")
+
+        self.language = meta["language"]
+        self.relations: List[str] = meta["relations"]
+        self.size = meta["concepts"]
+        self._columns = MappedColumns(index_dir, {"keys": "B", **COLUMNS})
+
+    def find(self, key: str) -> Optional[int]:
+        return self._columns.find_string("keys", key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.find(key) is not None
+
+    def edge_ids(self, key: str) -> List[int]:
+        position = self.find(key)
+        if position is None:
+            return []
+        indptr = self._columns["postings_indptr"]
+        return self._columns["postings"][indptr[position]:indptr[position + 1]].tolist()
+
+    def _node(self, position: int) -> Dict[str, str]:
+        key = self._columns.string("keys", position)
+        return {"@id": key, "label": concept_label(key), "language": self.language}
+
+    def edge(self, edge_id: int) -> Dict[str, Any]:
+        rel = self.relations[self._columns["edge_rel"][edge_id]]
+        return {
+            "rel": {"@id": rel, "label": rel.split("/")[-1]},
+            "start": self._node(self._columns["edge_start"][edge_id]),
+            "end": self._node(self._columns["edge_end"][edge_id]),
+            "weight": self._columns["edge_weight"][edge_id],
+        }
+
+    def edges(self, key: str) -> List[Dict[str, Any]]:
+        return [self.edge(edge_id) for edge_id in self.edge_ids(key)]
+
+    def close(self) -> None:
+        self._columns.close()
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+RELATIONS = ["RelatedTo", "IsA", "PartOf", "HasA", "UsedFor", "CapableOf",
+             "AtLocation", "Synonym", "Antonym", "DerivedFrom"]
+
+
+@dataclass(slots=True)
+class StandInConfig:
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    mean_degree: int = 40
+    max_degree: int = 5000
+    vocabulary: int = 50_000
+    page_size: int = 20
+
+
+def node(term: str, lang: str = "en") -> Dict[str, str]:
+    return {"@id": f"/c/{lang}/{term}", "label": term.replace("_", " "),
+            "language": lang}
+
+
+def synthetic_edges(term: str, config: StandInConfig) -> List[Dict[str, Any]]:
+    seed = int.from_bytes(hashlib.sha1(term.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    # Heavy tailed degrees, so that some words need many pages
+    degree = min(config.max_degree,
+                 int(rng.paretovariate(1.5) * config.mean_degree / 3))
+    edges = []
+    for _ in range(degree):
+        rel = rng.choice(RELATIONS)
+        other = f"word{rng.randrange(config.vocabulary)}"
+        start, end = (term, other) if rng.random() < 0.5 else (other, term)
+        edges.append({
+            "@id": f"/a/[/r/{rel}/,/c/en/{start}/,/c/en/{end}/]",
+            "rel": {"@id": f"/r/{rel}", "label": rel},
+            "start": node(start),
+            "end": node(end),
+            "weight": round(rng.uniform(0.5, 5.0), 3),
+        })
+    return edges
+
+
+def create_app(config: StandInConfig) -> web.Application:
+    async def get_concept(request: web.Request) -> web.Response:
+        delay = max(0.0, random.gauss(config.latency, config.jitter))
+        await asyncio.sleep(delay)
+
+        if random.random() < config.error_rate:
+            return web.Response(status=random.choice((500, 502, 503)))
+
+        lang = request.match_info["lang"]
+        term = request.match_info["term"]
+        try:
+            offset = int(request.query.get("offset", "0"))
+            limit = min(1000, int(request.query.get("limit", str(config.page_size))))
+        except ValueError:
+            return web.Response(status=400)
+
+        edges = synthetic_edges(term, config) if lang == "en" else []
+        view: Dict[str, Any] = {
+            "@id": f"/c/{lang}/{term}?offset={offset}&limit={limit}",
+            "firstPage": f"/c/{lang}/{term}?offset=0&limit={limit}",
+        }
+        if offset + limit < len(edges):
+            view["nextPage"] = f"/c/{lang}/{term}?offset={offset + limit}&limit={limit}"
+        if offset > 0:
+            view["previousPage"] = (f"/c/{lang}/{term}?offset="
+                                    f"{max(0, offset - limit)}&limit={limit}")
+
+        return web.json_response({
+            "@id": f"/c/{lang}/{term}",
+            "edges": edges[offset:offset + limit],
+            "view": view,
+        })
+
+    app = web.Application()
+    app.router.add_get("/c/{lang}/{term}", get_concept)
+    return app
+
+
+def serve(config: StandInConfig, host: str = "127.0.0.1", port: int = 8084) -> None:
+    logging.info(f"ConceptNet stand-in listening on http://{host}:{port}")
+    web.run_app(create_app(config), host=host, port=port, print=None,
+                access_log=None)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline ConceptNet API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8084)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02,
+                        help="Standard deviation of the response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability of answering with a 5xx error")
+    parser.add_argument("--mean-degree", type=int, default=40,
+                        help="Typical number of edges of a word")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args()
+    serve(StandInConfig(latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, mean_degree=args.mean_degree),
+          host=args.host, port=args.port)
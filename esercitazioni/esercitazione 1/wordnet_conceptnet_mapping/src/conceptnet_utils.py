@@ -1,13 +1,36 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
+import os
 import requests
 from requests.exceptions import RequestException
 
+from src.conceptnet_client import conceptnet_url
+from src.conceptnet_index import ConceptNetIndex, word_key
+
+_local_index: Optional[ConceptNetIndex] = None
+
+
+def use_local_index(index_dir: str) -> None:
+    global _local_index
+    _local_index = ConceptNetIndex(index_dir)
+    logging.info(f"Using local ConceptNet index at '{index_dir}' "
+                 f"({_local_index.size} concepts)")
+
+
+def get_local_index() -> Optional[ConceptNetIndex]:
+    if _local_index is None and os.getenv("CONCEPTNET_INDEX"):
+        use_local_index(os.environ["CONCEPTNET_INDEX"])
+    return _local_index
+
 
 def get_conceptnet_entries(word: str) -> List[Dict[str, Any]]:
+    local_index = get_local_index()
+    if local_index is not None:
+        return local_index.edges(word_key(word))
+
     try:
         normalized_word = word.lower().replace(" ", "_")
-        url = f"http://api.conceptnet.io/c/en/{normalized_word}"
+        url = f"{conceptnet_url()}/c/en/{normalized_word}"
 
         response = requests.get(url, timeout=10)
         response.raise_for_status()
@@ -0,0 +1,247 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+import glob
+import json
+import logging
+import os
+import time
+
+from lexical_tools.mapped import MappedColumns, write_column, write_strings
+from src.schema import ConceptNetRelation, SynsetData, WordNetToConceptNetResult
+
+STORE_VERSION = 2
+
+# name -> array typecode of every column file in the store directory
+COLUMNS = {
+    "words": "B",
+    "words_offsets": "Q",
+    "labels": "B",
+    "labels_offsets": "Q",
+    "synsets": "B",
+    "synsets_offsets": "Q",
+    "definitions": "B",
+    "definitions_offsets": "Q",
+    "edge_indptr": "Q",
+    "edge_rel": "H",
+    "edge_label": "I",
+    "word_synset_indptr": "Q",
+    "word_synsets": "I",
+    "synset_word_indptr": "Q",
+    "synset_words": "I",
+}
+
+
+def read_mapping(path: str) -> Iterator[Tuple[str, WordNetToConceptNetResult]]:
+    # Either a directory of --full JSONL shards or a single JSON sample file
+    if os.path.isdir(path):
+        for shard in sorted(glob.glob(os.path.join(path, "part-*.jsonl"))):
+            with open(shard, encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logging.warning(f"Skipping truncated line in {shard}")
+                        continue
+                    yield entry.pop("word"), entry
+    else:
+        with open(path, encoding="utf-8") as file:
+            for word, entry in json.load(file).items():
+                if entry is not None:
+                    yield word, entry
+
+
+def build_graph(mapping_path: str, store_dir: str) -> None:
+    start_time = time.perf_counter()
+
+    relation_ids: Dict[str, int] = {}
+    label_ids: Dict[str, int] = {}
+    definitions: Dict[str, str] = {}
+    # Every word owns one sorted block of (relation, label) pairs
+    blocks: Dict[str, Tuple[int, int, List[str]]] = {}
+    edge_rel = array("H")
+    edge_label = array("I")
+
+    for word, entry in read_mapping(mapping_path):
+        pairs = set()
+        for relation in entry.get("relations", []):
+            rel_id = relation_ids.setdefault(relation["relation"], len(relation_ids))
+            label_id = label_ids.setdefault(relation["target"], len(label_ids))
+            pairs.add((rel_id, label_id))
+
+        synset_names = []
+        for synset in entry.get("synsets", []):
+            definitions.setdefault(synset["name"], synset["definition"])
+            synset_names.append(synset["name"])
+
+        previous = blocks.get(word)
+        if previous is not None:
+            # A word found in several shards keeps the union of its entries,
+            # its earlier block is left behind and never copied
+            old_begin, old_end, old_names = previous
+            pairs.update(zip(edge_rel[old_begin:old_end], edge_label[old_begin:old_end]))
+            synset_names = old_names + synset_names
+
+        begin = len(edge_rel)
+        for rel_id, label_id in sorted(pairs):
+            edge_rel.append(rel_id)
+            edge_label.append(label_id)
+        blocks[word] = (begin, len(edge_rel), list(dict.fromkeys(synset_names)))
+
+    words = sorted(blocks)
+    synsets = sorted(definitions)
+    synset_rank = {name: position for position, name in enumerate(synsets)}
+
+    edge_indptr = array("Q", [0])
+    sorted_rel = array("H")
+    sorted_label = array("I")
+    word_synset_indptr = array("Q", [0])
+    word_synsets = array("I")
+    words_of_synset: List[List[int]] = [[] for _ in synsets]
+    for position, word in enumerate(words):
+        begin, end, synset_names = blocks[word]
+        sorted_rel.extend(edge_rel[begin:end])
+        sorted_label.extend(edge_label[begin:end])
+        edge_indptr.append(len(sorted_rel))
+        for name in synset_names:
+            word_synsets.append(synset_rank[name])
+            words_of_synset[synset_rank[name]].append(position)
+        word_synset_indptr.append(len(word_synsets))
+    del blocks, edge_rel, edge_label
+
+    synset_word_indptr = array("Q", [0])
+    synset_words = array("I")
+    for positions in words_of_synset:
+        synset_words.extend(positions)
+        synset_word_indptr.append(len(synset_words))
+
+    os.makedirs(store_dir, exist_ok=True)
+    write_strings(store_dir, "words", words)
+    write_strings(store_dir, "labels", sorted(label_ids, key=label_ids.__getitem__))
+    write_strings(store_dir, "synsets", synsets)
+    write_strings(store_dir, "definitions", [definitions[name] for name in synsets])
+    columns = {
+        "edge_indptr": edge_indptr,
+        "edge_rel": sorted_rel,
+        "edge_label": sorted_label,
+        "word_synset_indptr": word_synset_indptr,
+        "word_synsets": word_synsets,
+        "synset_word_indptr": synset_word_indptr,
+        "synset_words": synset_words,
+    }
+    for name, values in columns.items():
+        write_column(store_dir, name, values)
+
+    relations = sorted(relation_ids, key=relation_ids.__getitem__)
+    with open(os.path.join(store_dir, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump({
+            "version": STORE_VERSION,
+            "relations": relations,
+            "words": len(words),
+            "synsets": len(synsets),
+            "labels": len(label_ids),
+            "edges": len(sorted_rel),
+        }, file, indent=2)
+
+    logging.info(f"Stored {len(sorted_rel)} relations of {len(words)} words, "
+                 f"{len(synsets)} synsets and {len(label_ids)} distinct targets in "
+                 f"'{store_dir}' in {time.perf_counter() - start_time:.1f}s")
+
+
+class GraphStore:
+    def __init__(self, store_dir: str) -> None:
+        with open(os.path.join(store_dir, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported graph store version in '{store_dir}'")
+
+        self.relations: List[str] = meta["relations"]
+        self._relation_ids = {rel: i for i, rel in enumerate(self.relations)}
+        self.size = meta["words"]
+        self.synset_count = meta["synsets"]
+        self._columns = MappedColumns(store_dir, COLUMNS)
+
+    def find_word(self, word: str) -> Optional[int]:
+        return self._columns.find_string("words", word)
+
+    def find_synset(self, name: str) -> Optional[int]:
+        return self._columns.find_string("synsets", name)
+
+    def __contains__(self, word: str) -> bool:
+        return self.find_word(word) is not None
+
+    def _label(self, label_id: int) -> str:
+        return self._columns.string("labels", label_id)
+
+    def _edge_range(self, position: int, relation: Optional[str]) -> Tuple[int, int]:
+        indptr = self._columns["edge_indptr"]
+        begin, end = indptr[position], indptr[position + 1]
+        if relation is None:
+            return begin, end
+        rel_id = self._relation_ids.get(relation)
+        if rel_id is None:
+            return begin, begin
+        # Edges of a word are sorted by relation, so each relation is a contiguous run
+        rels = self._columns["edge_rel"]
+        return bisect_left(rels, rel_id, begin, end), bisect_right(rels, rel_id, begin, end)
+
+    def neighbours(self, word: str, relation: Optional[str] = None) -> List[str]:
+        position = self.find_word(word)
+        if position is None:
+            return []
+        begin, end = self._edge_range(position, relation)
+        return [self._label(label_id)
+                for label_id in self._columns["edge_label"][begin:end].tolist()]
+
+    def _relations_at(self, position: int) -> List[ConceptNetRelation]:
+        begin, end = self._edge_range(position, None)
+        return [{"relation": self.relations[rel_id], "target": self._label(label_id)}
+                for rel_id, label_id in zip(self._columns["edge_rel"][begin:end].tolist(),
+                                            self._columns["edge_label"][begin:end].tolist())]
+
+    def relations_of(self, word: str) -> List[ConceptNetRelation]:
+        position = self.find_word(word)
+        return [] if position is None else self._relations_at(position)
+
+    def synsets_of(self, word: str) -> List[SynsetData]:
+        position = self.find_word(word)
+        if position is None:
+            return []
+        indptr = self._columns["word_synset_indptr"]
+        return [self._synset(synset)
+                for synset in self._columns["word_synsets"][indptr[position]:
+                                                            indptr[position + 1]].tolist()]
+
+    def _synset(self, position: int) -> SynsetData:
+        return {
+            "name": self._columns.string("synsets", position),
+            "definition": self._columns.string("definitions", position),
+        }
+
+    def words_of_synset(self, name: str) -> List[str]:
+        position = self.find_synset(name)
+        if position is None:
+            return []
+        indptr = self._columns["synset_word_indptr"]
+        return [self._columns.string("words", word)
+                for word in self._columns["synset_words"][indptr[position]:
+                                                          indptr[position + 1]].tolist()]
+
+    def synset_relations(self, name: str) -> Dict[str, List[ConceptNetRelation]]:
+        position = self.find_synset(name)
+        if position is None:
+            return {}
+        indptr = self._columns["synset_word_indptr"]
+        return {self._columns.string("words", word): self._relations_at(word)
+                for word in self._columns["synset_words"][indptr[position]:
+                                                          indptr[position + 1]].tolist()}
+
+    def get(self, word: str) -> Optional[WordNetToConceptNetResult]:
+        if word not in self:
+            return None
+        return {"synsets": self.synsets_of(word), "relations": self.relations_of(word)}
+
+    def close(self) -> None:
+        self._columns.close()
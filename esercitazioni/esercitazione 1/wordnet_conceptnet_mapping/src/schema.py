@@ -0,0 +1,16 @@
+from typing import List, TypedDict
+
+
+class SynsetData(TypedDict):
+    name: str
+    definition: str
+
+
+class ConceptNetRelation(TypedDict):
+    relation: str
+    target: str
+
+
+class WordNetToConceptNetResult(TypedDict):
+    synsets: List[SynsetData]
+    relations: List[ConceptNetRelation]
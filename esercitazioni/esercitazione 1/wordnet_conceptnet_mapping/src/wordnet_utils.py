@@ -1,23 +1,57 @@
-from typing import List, Optional, TypedDict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from nltk.corpus.reader import Synset
 from nltk.corpus import wordnet as wn
+from src.conceptnet_client import ConceptNetClient
 from src.conceptnet_utils import get_conceptnet_entries
+from src.schema import ConceptNetRelation, WordNetToConceptNetResult
+import asyncio
 import logging
 
 
-class SynsetData(TypedDict):
-    name: str
-    definition: str
+def extract_relations(word: str, conceptnet_data: List[Dict[str, Any]]
+                      ) -> List[ConceptNetRelation]:
+    relations: List[ConceptNetRelation] = []
+    for edge in conceptnet_data:
+        try:
+            if (edge["start"]["language"] == "en" and
+                    edge["end"]["language"] == "en"):
 
+                rel = edge["rel"]["@id"].split("/")[-1]
+                start_label = edge["start"]["label"].lower()
+                end_label = edge["end"]["label"].lower()
+                word_lower = word.lower()
 
-class ConceptNetRelation(TypedDict):
-    relation: str
-    target: str
+                if end_label != word_lower:
+                    target = edge["end"]["label"]
+                elif start_label != word_lower:
+                    target = edge["start"]["label"]
+                else:
+                    continue
 
+                relations.append({
+                    "relation": rel,
+                    "target": target
+                })
+        except (KeyError, AttributeError):
+            continue
+    return relations
 
-class WordNetToConceptNetResult(TypedDict):
-    synsets: List[SynsetData]
-    relations: List[ConceptNetRelation]
+
+def build_result(word: str, synsets: List[Synset],
+                 conceptnet_data: List[Dict[str, Any]]) -> WordNetToConceptNetResult:
+    if not conceptnet_data:
+        logging.warning(f"No ConceptNet edges found for '{word}'")
+
+    return {
+        "synsets": [
+            {
+                "name": syn.name(),
+                "definition": syn.definition(),
+            }
+            for syn in synsets
+        ],
+        "relations": extract_relations(word, conceptnet_data)
+    }
 
 
 def wordnet_to_conceptnet(word: str) -> Optional[WordNetToConceptNetResult]:
@@ -27,46 +61,36 @@ def wordnet_to_conceptnet(word: str) -> Optional[WordNetToConceptNetResult]:
             logging.warning(f"No WordNet synsets found for '{word}'")
             return None
 
-        conceptnet_data = get_conceptnet_entries(word)
-        if not conceptnet_data:
-            logging.warning(f"No ConceptNet edges found for '{word}'")
-
-        relations: List[ConceptNetRelation] = []
-        for edge in conceptnet_data:
-            try:
-                if (edge["start"]["language"] == "en" and
-                        edge["end"]["language"] == "en"):
-
-                    rel = edge["rel"]["@id"].split("/")[-1]
-                    start_label = edge["start"]["label"].lower()
-                    end_label = edge["end"]["label"].lower()
-                    word_lower = word.lower()
-
-                    if end_label != word_lower:
-                        target = edge["end"]["label"]
-                    elif start_label != word_lower:
-                        target = edge["start"]["label"]
-                    else:
-                        continue
-
-                    relations.append({
-                        "relation": rel,
-                        "target": target
-                    })
-            except (KeyError, AttributeError):
-                continue
-
-        return {
-            "synsets": [
-                {
-                    "name": syn.name(),
-                    "definition": syn.definition(),
-                }
-                for syn in synsets
-            ],
-            "relations": relations
-        }
+        return build_result(word, synsets, get_conceptnet_entries(word))
+
+    except Exception as e:
+        logging.error(f"Failed to process word '{word}': {str(e)}")
+        return None
+
+
+async def wordnet_to_conceptnet_async(word: str, client: ConceptNetClient
+                                      ) -> Optional[WordNetToConceptNetResult]:
+    try:
+        synsets: List[Synset] = wn.synsets(word)
+        if not synsets:
+            logging.warning(f"No WordNet synsets found for '{word}'")
+            return None
+
+        conceptnet_data = await client.get_edges(word)
+        if conceptnet_data is None:
+            return None
+        return build_result(word, synsets, conceptnet_data)
 
     except Exception as e:
         logging.error(f"Failed to process word '{word}': {str(e)}")
         return None
+
+
+async def map_words(words: Iterable[str], client: ConceptNetClient
+                    ) -> AsyncIterator[Tuple[str, Optional[WordNetToConceptNetResult]]]:
+    async def map_word(word: str) -> Tuple[str, Optional[WordNetToConceptNetResult]]:
+        return word, await wordnet_to_conceptnet_async(word, client)
+
+    # The client bounds the requests in flight, results come back as they finish
+    for future in asyncio.as_completed([map_word(word) for word in words]):
+        yield await future
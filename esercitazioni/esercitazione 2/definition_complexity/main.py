@@ -1,11 +1,13 @@
 import os
 import logging
+import argparse
 from typing import Optional
 
 from dotenv import load_dotenv, find_dotenv
 from rich.console import Console
 import questionary
 
+from src.batch import run_batch
 from src.load_data import extract_definitions_to_word
 from src.similarity import (
     compute_semantic_similarities,
@@ -40,7 +42,29 @@ def load_environment() -> Optional[str]:
         return None
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Definition similarity")
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Score every term without prompting and save the results'
+    )
+    parser.add_argument(
+        '--output',
+        default='similarities.npz',
+        help='Compressed file written by --batch with per-pair scores and per-term aggregates'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Worker processes the lexical step may use on large inputs'
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     setup_logging()
     load_environment()
 
@@ -48,11 +72,15 @@ def main() -> None:
 
         definitions_csv = os.getenv("DEFINITIONS_CSV", "rsrc/definizioni.csv")
 
+        if args.batch:
+            run_batch(definitions_csv, args.output, args.workers)
+            return
+
         console = Console()
         definitions = extract_definitions_to_word(definitions_csv)
 
         semantic_results = compute_semantic_similarities(definitions)
-        lexical_results = compute_lexical_similarities(definitions)
+        lexical_results = compute_lexical_similarities(definitions, args.workers)
 
         if not definitions:
             logging.warning("No definitions found.")
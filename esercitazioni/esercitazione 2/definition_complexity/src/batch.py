@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+import logging
+import os
+import time
+
+import numpy as np
+
+from lexical_tools import translator_from_env
+from src.load_data import preprocess_definitions, read_definitions, translate_definitions
+from src.similarity import compute_lexical_scores, encode_definitions, semantic_scores
+
+STAGES = ["load", "translate", "preprocess", "encode", "score"]
+STATISTICS = ["mean", "median", "std"]
+
+
+@contextmanager
+def stage(timings: Dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+        logging.info(f"Stage '{name}' took {timings[name]:.2f}s")
+
+
+def aggregate(scores: np.ndarray) -> List[float]:
+    if not len(scores):
+        return [float("nan")] * len(STATISTICS)
+    return [float(np.mean(scores)), float(np.median(scores)), float(np.std(scores))]
+
+
+def save_results(output_path: str, definitions: Dict[str, List[str]],
+                 semantic: Dict[str, np.ndarray], lexical: Dict[str, np.ndarray],
+                 timings: Dict[str, float]) -> None:
+    # One row per pair, in combinations() order within each term
+    terms = list(definitions)
+    pair_term, pair_left, pair_right = [], [], []
+    for term_id, term in enumerate(terms):
+        left, right = np.triu_indices(len(definitions[term]), k=1)
+        pair_term.append(np.full(len(left), term_id, dtype=np.int32))
+        pair_left.append(left.astype(np.int32))
+        pair_right.append(right.astype(np.int32))
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    empty = np.empty(0, dtype=np.float32)
+    no_aggregates = np.empty((0, len(STATISTICS)))
+    np.savez_compressed(
+        output_path,
+        terms=np.array(terms, dtype=str),
+        definitions=np.array([defn for term in terms for defn in definitions[term]], dtype=str),
+        definition_offsets=np.cumsum([0] + [len(definitions[term]) for term in terms]),
+        pair_term=np.concatenate(pair_term) if terms else np.empty(0, dtype=np.int32),
+        pair_left=np.concatenate(pair_left) if terms else np.empty(0, dtype=np.int32),
+        pair_right=np.concatenate(pair_right) if terms else np.empty(0, dtype=np.int32),
+        semantic=np.concatenate([semantic[term] for term in terms] or [empty]).astype(np.float32),
+        lexical=np.concatenate([lexical[term] for term in terms] or [empty]).astype(np.float32),
+        statistics=np.array(STATISTICS, dtype=str),
+        semantic_aggregates=np.array([aggregate(semantic[term]) for term in terms]
+                                     or no_aggregates),
+        lexical_aggregates=np.array([aggregate(lexical[term]) for term in terms]
+                                    or no_aggregates),
+        stages=np.array(list(timings), dtype=str),
+        timings=np.array(list(timings.values())),
+    )
+    logging.info(f"Saved scores of {len(terms)} terms to '{output_path}'")
+
+
+def run_batch(csv_path: str, output_path: str, max_workers: int = 4) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+
+    with stage(timings, "load"):
+        raw_definitions = read_definitions(csv_path)
+
+    with stage(timings, "translate"):
+        translator = translator_from_env(source="it", target="en")
+        try:
+            translated = translate_definitions(raw_definitions, translator)
+        finally:
+            translator.close()
+
+    with stage(timings, "preprocess"):
+        definitions = preprocess_definitions(translated)
+
+    with stage(timings, "encode"):
+        embeddings = encode_definitions(definitions)
+
+    with stage(timings, "score"):
+        semantic = {term: semantic_scores(embeddings[term]) for term in definitions}
+        lexical = compute_lexical_scores(definitions, max_workers)
+
+    save_results(output_path, definitions, semantic, lexical, timings)
+
+    summary = {}
+    for term in definitions:
+        summary[term] = {
+            "pairs": len(semantic[term]),
+            "semantic": dict(zip(STATISTICS, aggregate(semantic[term]))),
+            "lexical": dict(zip(STATISTICS, aggregate(lexical[term]))),
+        }
+        sem = summary[term]["semantic"]
+        lex = summary[term]["lexical"]
+        logging.info(f"{term}: {summary[term]['pairs']} pairs, "
+                     f"SimSem {sem['mean']:.4f} (median {sem['median']:.4f}, "
+                     f"std {sem['std']:.4f}), "
+                     f"SimLex {lex['mean']:.4f} (median {lex['median']:.4f}, "
+                     f"std {lex['std']:.4f})")
+
+    logging.info("Timings: " + ", ".join(f"{name} {timings[name]:.2f}s" for name in STAGES))
+    return {"terms": summary, "timings": timings}
@@ -1,42 +1,12 @@
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-from deep_translator import GoogleTranslator
-
-nltk_packages = ["punkt", "punkt_tab", "stopwords", "wordnet"]
-for pkg in nltk_packages:
-    try:
-        nltk.data.find(f"corpora/{pkg}")
-    except LookupError:
-        nltk.download(pkg)
-
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words("english"))
-
-
-def translate_texts(texts: List[str], target: str = "en") -> List[str]:
-    try:
-        return GoogleTranslator(source="auto", target=target).translate_batch(texts)
-    except Exception as e:
-        logging.warning(f"Batch translation failed: {e}")
-        return texts
 
+from lexical_tools import Translator, preprocess_texts, translator_from_env
 
-def preprocess_text(text: str) -> str:
-    tokens = word_tokenize(text.lower())
-    return " ".join(
-        lemmatizer.lemmatize(token)
-        for token in tokens
-        if token.isalpha() and token not in stop_words
-    )
 
-
-def extract_definitions_to_word(csv_path: str) -> Dict[str, List[str]]:
+def read_definitions(csv_path: str) -> Dict[str, List[str]]:
     try:
         df = pd.read_csv(csv_path)
     except Exception as e:
@@ -47,26 +17,57 @@ def extract_definitions_to_word(csv_path: str) -> Dict[str, List[str]]:
         logging.error("Missing 'Termine' column in CSV.")
         return {}
 
-    definitions_dict = {}
+    raw_definitions = {}
 
     for _, row in df.iterrows():
         term = str(row.get("Termine", "")).strip()
         if not term:
             continue
 
-        raw_definitions = [
+        definitions = [
             str(cell).strip()
             for cell in row[2:].dropna().tolist()
             if str(cell).strip()
         ]
 
-        if not raw_definitions:
+        if not definitions:
             logging.info(f"No definitions found for term '{term}'")
             continue
 
-        translated_defs = translate_texts(raw_definitions)
-        processed_defs = [preprocess_text(d) for d in translated_defs]
+        raw_definitions[term] = definitions
+
+    return raw_definitions
 
-        definitions_dict[term] = processed_defs
 
-    return definitions_dict
+def translate_definitions(raw_definitions: Dict[str, List[str]],
+                          translator: Translator) -> Dict[str, List[str]]:
+    # Definitions of every row go through the translator at once
+    texts = [defn for defs in raw_definitions.values() for defn in defs]
+    translations = dict(zip(texts, translator.translate(texts)))
+    logging.info(f"Translations: {translator.stats()}")
+    return {term: [translations[defn] for defn in defs]
+            for term, defs in raw_definitions.items()}
+
+
+def preprocess_definitions(definitions: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    texts = [defn for defs in definitions.values() for defn in defs]
+    processed = iter(preprocess_texts(texts))
+    return {term: [next(processed) for _ in defs]
+            for term, defs in definitions.items()}
+
+
+def extract_definitions_to_word(csv_path: str,
+                                translator: Optional[Translator] = None
+                                ) -> Dict[str, List[str]]:
+    raw_definitions = read_definitions(csv_path)
+
+    own_translator = translator is None
+    if own_translator:
+        translator = translator_from_env(source="it", target="en")
+    try:
+        translated = translate_definitions(raw_definitions, translator)
+    finally:
+        if own_translator:
+            translator.close()
+
+    return preprocess_definitions(translated)
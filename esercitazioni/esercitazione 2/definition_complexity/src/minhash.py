@@ -0,0 +1,82 @@
+from typing import List, Set, Tuple
+import logging
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+PRIME = (1 << 31) - 1
+
+_uneven_bands: Set[Tuple[int, int]] = set()
+
+
+def minhash_signatures(matrix: csr_matrix, num_perm: int = 128,
+                       seed: int = 0) -> np.ndarray:
+    # h(x) = (a * x + b) mod p on the token ids, minimum over the tokens of each row
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, num_perm, dtype=np.int64)
+    b = rng.integers(0, PRIME, num_perm, dtype=np.int64)
+
+    signatures = np.full((matrix.shape[0], num_perm), PRIME, dtype=np.int64)
+    sizes = np.diff(matrix.indptr)
+    if not matrix.nnz:
+        return signatures
+
+    hashes = (matrix.indices.astype(np.int64)[:, None] * a + b) % PRIME
+    nonempty = sizes > 0
+    signatures[nonempty] = np.minimum.reduceat(hashes, matrix.indptr[:-1][nonempty], axis=0)
+    return signatures
+
+
+def lsh_candidates(signatures: np.ndarray, bands: int) -> np.ndarray:
+    # Rows sharing a bucket in at least one band, as sorted (i, j) pairs with i < j
+    n, num_perm = signatures.shape
+    if not 1 <= bands <= num_perm:
+        raise ValueError(f"bands must be between 1 and {num_perm}, got {bands}")
+    if num_perm % bands and (num_perm, bands) not in _uneven_bands:
+        _uneven_bands.add((num_perm, bands))
+        logging.warning(f"{num_perm} permutations are not a multiple of {bands} bands, "
+                        f"the last {num_perm % bands} are left out of the buckets")
+    rows = num_perm // bands
+    pairs: List[np.ndarray] = []
+    for band in range(bands):
+        # Folds the rows of the band into one key, a collision only adds a candidate
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys = keys * np.uint64(1_000_003) ^ column.astype(np.uint64)
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [n]))
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = order[start:end]
+            left, right = np.triu_indices(len(members), k=1)
+            pairs.append(np.stack([members[left], members[right]], axis=1))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    candidates = np.sort(np.concatenate(pairs), axis=1)
+    codes = np.unique(candidates[:, 0] * n + candidates[:, 1])
+    return np.stack([codes // n, codes % n], axis=1)
+
+
+def minhash_jaccard(matrix: csr_matrix, num_perm: int = 128, bands: int = 64,
+                    seed: int = 0) -> np.ndarray:
+    # Approximate upper triangle: pairs that never share a bucket are scored 0
+    n = matrix.shape[0]
+    scores = np.zeros(n * (n - 1) // 2, dtype=np.float32)
+    if n < 2:
+        return scores
+
+    signatures = minhash_signatures(matrix, num_perm, seed)
+    # Empty rows share the all-PRIME signature and would all collide in every band
+    nonempty = np.flatnonzero(np.diff(matrix.indptr) > 0)
+    candidates = nonempty[lsh_candidates(signatures[nonempty], bands)]
+    if not len(candidates):
+        return scores
+
+    left, right = candidates[:, 0], candidates[:, 1]
+    estimates = (signatures[left] == signatures[right]).mean(axis=1)
+    # Position of (i, j) in combinations(range(n), 2) order
+    positions = left * n - left * (left + 1) // 2 + (right - left - 1)
+    scores[positions] = estimates
+    return scores
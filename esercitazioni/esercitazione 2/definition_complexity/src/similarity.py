@@ -1,69 +1,179 @@
-from typing import Dict, Tuple, List
+from typing import Any, Dict, Tuple, List
 from itertools import combinations
 from statistics import mean
 from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import time
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from scipy.sparse import csr_matrix
 from rich.table import Table
 from rich.box import HEAVY
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from src.minhash import minhash_jaccard
 
+_model: Any = None
 
-def compute_semantic_for_term(term_defs: Tuple[str, List[str]]
-                              ) -> Tuple[str, List[Tuple[str, str, float]]]:
-    term, defs = term_defs
-    if len(defs) < 2:
-        return term, []
 
-    embeddings = model.encode(defs, show_progress_bar=False)
-    results = [
-        (defs[i], defs[j], cosine_similarity([embeddings[i]], [embeddings[j]])[0][0])
-        for i, j in combinations(range(len(defs)), 2)
-    ]
-    return term, results
+def get_model() -> Any:
+    # Loaded once, on first use, and only in the main process
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
 
+        start = time.perf_counter()
+        model_name = os.getenv("SENTENCE_MODEL", "all-MiniLM-L6-v2")
+        _model = SentenceTransformer(model_name)
+        logging.info(f"Loaded sentence encoder '{model_name}' "
+                     f"in {time.perf_counter() - start:.2f}s")
+    return _model
 
-def lexical_similarity(str1: str, str2: str) -> float:
-    words1 = set(str1.lower().split())
-    words2 = set(str2.lower().split())
-    intersection = words1.intersection(words2)
-    union = words1.union(words2)
-    if not union:
-        return 0.0
-    return len(intersection) / len(union)
 
+def encode_definitions(definitions_dict: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+    # A single encode call for the definitions of every term, rows are unit vectors
+    terms = list(definitions_dict)
+    all_defs = [defn for term in terms for defn in definitions_dict[term]]
+    if not all_defs:
+        return {term: np.empty((0, 0), dtype=np.float32) for term in terms}
 
-def compute_lexical_for_term(term_defs: Tuple[str, List[str]]
-                               ) -> Tuple[str, List[Tuple[str, str, float]]]:
-    term, defs = term_defs
+    model = get_model()
+    start = time.perf_counter()
+    embeddings = model.encode(all_defs,
+                              batch_size=int(os.getenv("SENTENCE_BATCH_SIZE", "64")),
+                              normalize_embeddings=True,
+                              convert_to_numpy=True,
+                              show_progress_bar=False)
+    logging.info(f"Encoded {len(all_defs)} definitions of {len(terms)} terms "
+                 f"in {time.perf_counter() - start:.2f}s")
+
+    encoded = {}
+    start = 0
+    for term in terms:
+        end = start + len(definitions_dict[term])
+        encoded[term] = embeddings[start:end]
+        start = end
+    return encoded
+
+
+def upper_triangle(matrix: np.ndarray) -> np.ndarray:
+    # Same pair order as combinations(range(n), 2)
+    rows, cols = np.triu_indices(matrix.shape[0], k=1)
+    return matrix[rows, cols]
+
+
+def semantic_scores(embeddings: np.ndarray) -> np.ndarray:
+    if len(embeddings) < 2:
+        return np.empty(0, dtype=np.float32)
+    return upper_triangle(embeddings @ embeddings.T)
+
+
+def compute_semantic_scores(definitions_dict: Dict[str, List[str]]
+                            ) -> Dict[str, np.ndarray]:
+    return {term: semantic_scores(embeddings)
+            for term, embeddings in encode_definitions(definitions_dict).items()}
+
+
+def score_pairs(defs: List[str], scores: np.ndarray) -> List[Tuple[str, str, float]]:
+    return [(def1, def2, float(score))
+            for (def1, def2), score in zip(combinations(defs, 2), scores)]
+
+
+def term_matrix(defs: List[str]) -> csr_matrix:
+    # Binary document-term matrix, each definition is tokenized once
+    vocabulary: Dict[str, int] = {}
+    indices: List[int] = []
+    indptr = [0]
+    for defn in defs:
+        token_ids = {vocabulary.setdefault(token, len(vocabulary))
+                     for token in defn.lower().split()}
+        indices.extend(sorted(token_ids))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return csr_matrix((data, indices, indptr), shape=(len(defs), len(vocabulary)))
+
+
+def jaccard_scores(matrix: csr_matrix) -> np.ndarray:
+    intersection = (matrix @ matrix.T).toarray()
+    sizes = np.diff(matrix.indptr).astype(np.float32)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    jaccard = np.divide(intersection, union,
+                        out=np.zeros_like(intersection), where=union > 0)
+    return upper_triangle(jaccard)
+
+
+def lexical_method(size: int) -> str:
+    method = os.getenv("LEXICAL_METHOD", "auto").strip().lower()
+    if method == "auto":
+        threshold = int(os.getenv("LEXICAL_MINHASH_MIN_DEFS", "10000"))
+        return "minhash" if size >= threshold else "exact"
+    if method not in ("exact", "minhash"):
+        raise ValueError(f"Unknown lexical similarity method '{method}'")
+    return method
+
+
+def lexical_scores(defs: List[str]) -> np.ndarray:
     if len(defs) < 2:
-        return term, []
+        return np.empty(0, dtype=np.float32)
+
+    matrix = term_matrix(defs)
+    if lexical_method(len(defs)) == "minhash":
+        return minhash_jaccard(matrix,
+                               num_perm=int(os.getenv("LEXICAL_MINHASH_PERM", "128")),
+                               bands=int(os.getenv("LEXICAL_LSH_BANDS", "64")))
+    return jaccard_scores(matrix)
+
+
+def lexical_scores_for_term(term_defs: Tuple[str, List[str]]
+                            ) -> Tuple[str, np.ndarray]:
+    term, defs = term_defs
+    return term, lexical_scores(defs)
 
-    results = [
-        (def1, def2, lexical_similarity(def1, def2))
-        for def1, def2 in combinations(defs, 2)
-    ]
-    return term, results
+
+def lexical_strategy(definitions_dict: Dict[str, List[str]], max_workers: int) -> int:
+    # Worker count for the lexical step, 1 when a pool would cost more than it saves
+    pairs = sum(len(defs) * (len(defs) - 1) // 2 for defs in definitions_dict.values())
+    min_pairs = int(os.getenv("LEXICAL_PARALLEL_PAIRS", "2000000"))
+    if pairs < min_pairs:
+        return 1
+    return max(1, min(max_workers, len(definitions_dict)))
 
 
 def compute_semantic_similarities(
+    definitions_dict: Dict[str, List[str]]
+) -> Dict[str, List[Tuple[str, str, float]]]:
+    scores = compute_semantic_scores(definitions_dict)
+    return {term: score_pairs(defs, scores[term])
+            for term, defs in definitions_dict.items()}
+
+
+def compute_lexical_scores(
     definitions_dict: Dict[str, List[str]],
     max_workers: int = 4
-) -> Dict[str, List[Tuple[str, str, float]]]:
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        results = executor.map(compute_semantic_for_term, definitions_dict.items())
-    return dict(results)
+) -> Dict[str, np.ndarray]:
+    workers = lexical_strategy(definitions_dict, max_workers)
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = dict(executor.map(lexical_scores_for_term, definitions_dict.items()))
+        strategy = f"process pool ({workers} workers)"
+    else:
+        results = dict(map(lexical_scores_for_term, definitions_dict.items()))
+        strategy = "in process"
+
+    pairs = sum(len(scores) for scores in results.values())
+    logging.info(f"Lexical similarity: {pairs} pairs of {len(results)} terms, "
+                 f"{strategy}, {time.perf_counter() - start:.2f}s")
+    return results
 
 
 def compute_lexical_similarities(
     definitions_dict: Dict[str, List[str]],
     max_workers: int = 4
 ) -> Dict[str, List[Tuple[str, str, float]]]:
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        results = executor.map(compute_lexical_for_term, definitions_dict.items())
-    return dict(results)
+    scores = compute_lexical_scores(definitions_dict, max_workers)
+    return {term: score_pairs(defs, scores[term])
+            for term, defs in definitions_dict.items()}
 
 
 def create_similarity_table(
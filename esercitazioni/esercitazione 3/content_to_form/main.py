@@ -1,14 +1,20 @@
 import os
+import json
 import logging
 import argparse
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv, find_dotenv
-from nltk.corpus import wordnet as en_wordnet
-from deep_translator import GoogleTranslator
+from lexical_tools import (
+    Translator,
+    ensure_nltk_resources,
+    get_wordnet_index,
+    translator_from_env,
+)
 
 from src.load_data import extract_definitions_to_word
-from src.guessing import guess_synset
+from src.evaluation import evaluate, log_report, run_bench, summarize
+from src.guessing import term_synset_names
 
 
 def setup_logging() -> None:
@@ -19,12 +25,14 @@ def setup_logging() -> None:
     )
 
 
-def translate_to_english(text: str) -> str:
-    try:
-        return GoogleTranslator(source='it', target='en').translate(text)
-    except Exception as e:
-        logging.warning(f"Translation failed for text: {text}. Error: {e}")
-        return text
+def translate_to_english(translator: Translator,
+                         definitions_dict: Dict[str, List[str]]) -> Dict[str, str]:
+    # Terms and definitions of the whole run go through the translator at once
+    texts = list(definitions_dict) + [
+        defn for definitions in definitions_dict.values() for defn in definitions]
+    translations = dict(zip(texts, translator.translate(texts)))
+    logging.info(f"Translations: {translator.stats()}")
+    return translations
 
 
 def load_environment() -> Optional[str]:
@@ -45,58 +53,94 @@ def parse_args() -> argparse.Namespace:
         action='store_true',
         help='Enable detailed debug logging'
     )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=3,
+        help='Number of ranked synsets considered for top-k accuracy'
+    )
+    parser.add_argument(
+        '--gold',
+        default=os.getenv("GOLD_SYNSETS"),
+        help='JSON file mapping each term to its expected WordNet synset'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes the terms are evaluated on'
+    )
+    parser.add_argument(
+        '--report',
+        default=None,
+        help='Write the per-term evaluation report as JSON to this file'
+    )
+    parser.add_argument(
+        '--bench',
+        action='store_true',
+        help='Time the guesser on synthetic definition sets of growing size'
+    )
+    parser.add_argument(
+        '--bench-sizes',
+        default='100,1000,10000',
+        help='Comma separated sizes of the synthetic definition sets'
+    )
     return parser.parse_args()
 
 
+def load_gold(path: Optional[str]) -> Dict[str, str]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_report(path: str, report: Any) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    logging.info(f"Saved evaluation report to {path}")
+
+
 def main() -> None:
     args = parse_args()
     setup_logging()
     load_environment()
+    if get_wordnet_index() is None:
+        ensure_nltk_resources("wordnet")
 
     try:
+        if args.bench:
+            sizes = [int(size) for size in args.bench_sizes.split(',')]
+            results = run_bench(sizes, args.top_k, args.workers)
+            if args.report:
+                save_report(args.report, results)
+            return
+
         definitions_csv = os.getenv("DEFINITIONS_CSV", "rsrc/definizioni.csv")
         definitions_dict = extract_definitions_to_word(definitions_csv)
-
+        gold = load_gold(args.gold)
+        translator = translator_from_env(source='it', target='en')
+        try:
+            translations = translate_to_english(translator, definitions_dict)
+        finally:
+            translator.close()
+
+        tasks = []
         for term, definitions in definitions_dict.items():
-            term_en = translate_to_english(term)
-            term_synsets = en_wordnet.synsets(term_en, pos='n')
-
-            if args.debug:
-                logging.info(f"\nTerm: {term} ({term_en})"
-                             f"→ Possible Synsets: {term_synsets}")
-
-            total = 0
-            correct = 0
-
-            for defn in definitions:
-                defn_translated = translate_to_english(defn)
-                predicted_synset = guess_synset(term_en, defn_translated)
-
-                if args.debug:
-                    logging.info(f"\nDefinition (IT): {defn}")
-                    logging.info(f"Definition (EN): {defn_translated}")
-                    logging.info(f"Predicted Synset: {predicted_synset}")
-
-                total += 1
-
-                if predicted_synset and term_synsets:
-                    if predicted_synset in term_synsets:
-                        correct += 1
-                        if args.debug:
-                            logging.info("Synset Match!")
-                    else:
-                        if args.debug:
-                            logging.info("Synset Mismatch.")
-                else:
-                    if args.debug:
-                        logging.warning("Synset could not be resolved.")
-
-            if total > 0:
-                accuracy = (correct / total) * 100
-                logging.info(f"\nAccuracy for '{term}' ({term_en}):"
-                             f"{accuracy:.2f}% ({correct}/{total})")
-            else:
-                logging.info(f"\nNo definitions to evaluate for '{term}'.")
+            term_en = translations[term]
+            # Without a gold synset a guess counts when it resolves to a sense of the term
+            targets = [gold[term]] if term in gold else term_synset_names(term_en)
+            tasks.append((term, term_en,
+                          [translations[defn] for defn in definitions], targets))
+
+        reports = evaluate(tasks, args.top_k, args.workers)
+        for report, task, definitions in zip(reports, tasks, definitions_dict.values()):
+            log_report(report, definitions, task[2], args.debug)
+
+        summary = summarize(reports)
+        logging.info(f"Overall: {summary}")
+        if args.report:
+            save_report(args.report, {"summary": summary, "terms": reports})
 
     except KeyboardInterrupt:
         logging.info("Exiting!")
@@ -1,2 +1,2 @@
 from src.load_data import extract_definitions_to_word
-from src.guessing import guess_synset
+from src.guessing import guess_synset, guess_synset_name, guess_synsets
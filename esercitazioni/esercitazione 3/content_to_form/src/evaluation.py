@@ -0,0 +1,229 @@
+from concurrent.futures import ProcessPoolExecutor
+from statistics import mean, median
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import multiprocessing
+import random
+import time
+
+from nltk.corpus import wordnet as en_wordnet
+
+from lexical_tools import get_preprocessor, get_wordnet_index
+from src.guessing import (
+    extract_genus_candidates,
+    genus_key,
+    get_synset_cache,
+    rank_synsets,
+    term_ancestors,
+    term_synset_names,
+)
+
+# term, term_en, definitions_en, expected synset names
+EvaluationTask = Tuple[str, str, List[str], List[str]]
+
+# name -> (hits, misses) of every cache the guesser goes through
+CACHES = {
+    "synsets": lambda: tuple(get_synset_cache().cache_info()[:2]),
+    "genus_key": lambda: tuple(genus_key.cache_info()[:2]),
+    "lemmatize": lambda: (get_preprocessor().lemma_hits, get_preprocessor().lemma_misses),
+}
+
+
+def init_worker() -> None:
+    # Pays for the WordNet load once per process instead of inside the first term
+    index = get_wordnet_index()
+    if index is None:
+        en_wordnet.ensure_loaded()
+        term_ancestors("entity")
+    extract_genus_candidates("warm up")
+
+
+def cache_counters() -> Dict[str, Tuple[int, int]]:
+    return {name: counters() for name, counters in CACHES.items()}
+
+
+def cache_report(before: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for name, (hits, misses) in cache_counters().items():
+        hits -= before[name][0]
+        misses -= before[name][1]
+        report[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+    return report
+
+
+def latency_report(latencies: Sequence[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(latencies)
+    return {
+        "mean": 1000 * mean(ordered),
+        "p50": 1000 * median(ordered),
+        "p95": 1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "max": 1000 * ordered[-1],
+    }
+
+
+def evaluate_term(task: EvaluationTask, top_k: int) -> Dict[str, Any]:
+    term, term_en, definitions_en, targets = task
+    before = cache_counters()
+
+    start = time.perf_counter()
+    names, descendants = term_ancestors(term_en)
+    setup = time.perf_counter() - start
+
+    latencies = []
+    rankings = []
+    for defn_en in definitions_en:
+        start = time.perf_counter()
+        rankings.append(rank_synsets(names, descendants, extract_genus_candidates(defn_en)))
+        latencies.append(time.perf_counter() - start)
+
+    predictions = [ranked[0][0] if ranked else None for ranked in rankings]
+    correct = sum(1 for predicted in predictions if predicted and predicted in targets)
+    correct_top_k = sum(1 for ranked in rankings
+                        if any(name in targets for name, _ in ranked[:top_k]))
+    total = len(definitions_en)
+
+    return {
+        "term": term,
+        "term_en": term_en,
+        "term_synsets": names,
+        "targets": targets,
+        "definitions": total,
+        "correct": correct,
+        "accuracy": correct / total if total else 0.0,
+        "top_k": top_k,
+        "top_k_accuracy": correct_top_k / total if total else 0.0,
+        "setup_ms": 1000 * setup,
+        "latency_ms": latency_report(latencies),
+        "caches": cache_report(before),
+        "predictions": predictions,
+        "rankings": [ranked[:top_k] for ranked in rankings],
+    }
+
+
+def evaluate(tasks: Sequence[EvaluationTask], top_k: int = 3,
+             workers: int = 1) -> List[Dict[str, Any]]:
+    if workers <= 1:
+        init_worker()
+        return [evaluate_term(task, top_k) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (4 * workers))
+    # Workers open their own WordNet files in init_worker, forked ones would share the
+    # parent's file offsets. The fork server imports the modules once for all of them
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["src.evaluation"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker) as executor:
+        return list(executor.map(evaluate_term, tasks, [top_k] * len(tasks),
+                                 chunksize=chunksize))
+
+
+def summarize(reports: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    total = sum(report["definitions"] for report in reports)
+    if not total:
+        return {"terms": len(reports), "definitions": 0}
+
+    def weighted(key: str) -> float:
+        return sum(report[key] * report["definitions"] for report in reports) / total
+
+    return {
+        "terms": len(reports),
+        "definitions": total,
+        "accuracy": weighted("accuracy"),
+        "top_k_accuracy": weighted("top_k_accuracy"),
+        "mean_latency_ms": sum(report["latency_ms"]["mean"] * report["definitions"]
+                               for report in reports) / total,
+    }
+
+
+def synset_definition(name: str) -> str:
+    index = get_wordnet_index()
+    if index is not None:
+        return index.definition(index.find(name))
+    return en_wordnet.synset(name).definition()
+
+
+def synthetic_tasks(size: int, seed: int = 0,
+                    definitions_per_term: int = 20) -> List[EvaluationTask]:
+    # WordNet glosses of a term's senses, each with that sense as the expected answer
+    rng = random.Random(seed)
+    index = get_wordnet_index()
+    lemma_names = (index.lemma_names('n') if index is not None
+                   else en_wordnet.all_lemma_names(pos='n'))
+    nouns = sorted(name for name in lemma_names if '_' not in name)
+    tasks: List[EvaluationTask] = []
+    remaining = size
+    while remaining > 0:
+        term = rng.choice(nouns)
+        names = term_synset_names(term)
+        count = min(remaining, definitions_per_term)
+        chosen = [rng.choice(names) for _ in range(count)]
+        for name in dict.fromkeys(chosen):
+            tasks.append((term, term, [synset_definition(name)] * chosen.count(name), [name]))
+        remaining -= count
+    return tasks
+
+
+def run_bench(sizes: Iterable[int], top_k: int = 3, workers: int = 1,
+              seed: int = 0) -> List[Dict[str, Any]]:
+    results = []
+    for size in sizes:
+        tasks = synthetic_tasks(size, seed)
+        start = time.perf_counter()
+        reports = evaluate(tasks, top_k, workers)
+        elapsed = time.perf_counter() - start
+
+        summary = summarize(reports)
+        summary.update({
+            "size": size,
+            "workers": workers,
+            "elapsed_s": elapsed,
+            "definitions_per_s": size / elapsed if elapsed else 0.0,
+        })
+        results.append(summary)
+        logging.info(f"{size} definitions: {summary['definitions_per_s']:.1f} defs/s, "
+                     f"{summary['mean_latency_ms']:.3f} ms/def, "
+                     f"top-1 {summary['accuracy']:.2%}, "
+                     f"top-{top_k} {summary['top_k_accuracy']:.2%}")
+    return results
+
+
+def log_report(report: Dict[str, Any], definitions: Optional[Sequence[str]] = None,
+               definitions_en: Optional[Sequence[str]] = None,
+               debug: bool = False) -> None:
+    if debug:
+        logging.info(f"\nTerm: {report['term']} ({report['term_en']})"
+                     f"→ Possible Synsets: {report['term_synsets']}")
+        for index, (predicted, ranked) in enumerate(zip(report["predictions"],
+                                                        report["rankings"])):
+            if definitions is not None:
+                logging.info(f"\nDefinition (IT): {definitions[index]}")
+            if definitions_en is not None:
+                logging.info(f"Definition (EN): {definitions_en[index]}")
+            logging.info(f"Predicted Synset: {predicted}")
+            logging.info(f"Ranking: {ranked}")
+
+            if predicted and report["targets"]:
+                if predicted in report["targets"]:
+                    logging.info("Synset Match!")
+                else:
+                    logging.info("Synset Mismatch.")
+            else:
+                logging.warning("Synset could not be resolved.")
+
+    if report["definitions"]:
+        logging.info(f"\nAccuracy for '{report['term']}' ({report['term_en']}):"
+                     f"{100 * report['accuracy']:.2f}% "
+                     f"({report['correct']}/{report['definitions']}), "
+                     f"top-{report['top_k']}: {100 * report['top_k_accuracy']:.2f}%, "
+                     f"{report['latency_ms']['mean']:.3f} ms/definition")
+    else:
+        logging.info(f"\nNo definitions to evaluate for '{report['term']}'.")
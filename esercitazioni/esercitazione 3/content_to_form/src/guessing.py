@@ -1,38 +1,108 @@
-from typing import List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
 
 from nltk.corpus import wordnet as en_wordnet
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+from nltk.corpus.reader.wordnet import Synset
 from functools import lru_cache
 
-lemmatizer = WordNetLemmatizer()
+from lexical_tools import get_preprocessor, get_wordnet_index
+from src.synset_cache import SynsetCache, SynsetNames, synset_cache_from_env
 
+RankedSynsets = List[Tuple[str, float]]
 
-@lru_cache(maxsize=None)
-def cached_synsets(word: str, pos='n') -> Tuple[..., ...]:
-    return tuple(en_wordnet.synsets(word, pos=pos))
+GENUS_CACHE_SIZE = 50_000
+
+_synset_cache: Optional[SynsetCache] = None
+
+
+def lookup_synset_names(word: str, pos: str = 'n') -> SynsetNames:
+    return tuple(syn.name() for syn in en_wordnet.synsets(word, pos=pos))
+
+
+def get_synset_cache() -> SynsetCache:
+    # Built on first use so SYNSET_CACHE* from the .env file are already loaded
+    global _synset_cache
+    if _synset_cache is None:
+        _synset_cache = synset_cache_from_env(lookup_synset_names)
+    return _synset_cache
 
 
 def extract_genus_candidates(defn_en: str) -> List[str]:
-    tokens = word_tokenize(defn_en.lower())
-    tokens_lem = [lemmatizer.lemmatize(token) for token in tokens if token.isalpha()]
-    return tokens_lem
+    # Shares the bounded lemma memo of the preprocessor used by load_data
+    preprocessor = get_preprocessor()
+    tokens = preprocessor.tokenize(defn_en.lower())
+    return [preprocessor.lemma(token) for token in tokens if token.isalpha()]
+
+
+def term_synset_names(term_en: str) -> List[str]:
+    index = get_wordnet_index()
+    if index is not None:
+        return index.synsets(term_en, pos='n')
+    return list(get_synset_cache().get(term_en, 'n'))
+
+
+@lru_cache(maxsize=GENUS_CACHE_SIZE)
+def genus_key(genus_word: str) -> Optional[Hashable]:
+    # The genus of a candidate word is its first noun synset, as an id or a name
+    index = get_wordnet_index()
+    if index is not None:
+        genus_ids = index.synset_ids(genus_word, pos='n')
+        return genus_ids[0] if genus_ids else None
+    genus_names = get_synset_cache().get(genus_word, 'n')
+    return genus_names[0] if genus_names else None
 
 
-def guess_synset(term_en: str, defn_en: str) -> Optional[en_wordnet.synset]:
-    candidate_genus = extract_genus_candidates(defn_en)
-    term_synsets = cached_synsets(term_en, pos='n')
-    if not term_synsets or not candidate_genus:
-        return None
+def term_ancestors(term_en: str) -> Tuple[List[str], Dict[Hashable, List[int]]]:
+    # Maps every ancestor of the term synsets to the term synsets below it
+    index = get_wordnet_index()
+    descendants: Dict[Hashable, List[int]] = {}
+    if index is not None:
+        term_ids = index.synset_ids(term_en, pos='n')
+        names = [index.name(syn_id) for syn_id in term_ids]
+        closures = [index.ancestors(syn_id).tolist() for syn_id in term_ids]
+    else:
+        names = term_synset_names(term_en)
+        closures = [{ancestor.name() for path in en_wordnet.synset(name).hypernym_paths()
+                     for ancestor in path}
+                    for name in names]
 
-    for genus_word in candidate_genus:
-        genus_synsets = cached_synsets(genus_word, pos='n')
-        if not genus_synsets:
+    for position, closure in enumerate(closures):
+        for ancestor in closure:
+            descendants.setdefault(ancestor, []).append(position)
+    return names, descendants
+
+
+def rank_synsets(names: List[str], descendants: Dict[Hashable, List[int]],
+                 candidate_genus: List[str]) -> RankedSynsets:
+    if not names or not candidate_genus:
+        return []
+
+    # A term synset is placed at the earliest token whose genus is one of its ancestors
+    first_match: Dict[int, int] = {}
+    for token_position, genus_word in enumerate(candidate_genus):
+        key = genus_key(genus_word)
+        if key is None:
             continue
-        genus_synset = genus_synsets[0]
+        for position in descendants.get(key, ()):
+            first_match.setdefault(position, token_position)
+        if len(first_match) == len(names):
+            break
+
+    ranked = sorted(first_match.items(), key=lambda item: (item[1], item[0]))
+    return [(names[position], 1.0 - token_position / len(candidate_genus))
+            for position, token_position in ranked]
+
+
+def guess_synsets(term_en: str, definitions_en: Sequence[str]) -> List[RankedSynsets]:
+    names, descendants = term_ancestors(term_en)
+    return [rank_synsets(names, descendants, extract_genus_candidates(defn_en))
+            for defn_en in definitions_en]
+
+
+def guess_synset_name(term_en: str, defn_en: str) -> Optional[str]:
+    ranked = guess_synsets(term_en, [defn_en])[0]
+    return ranked[0][0] if ranked else None
 
-        for syn in term_synsets:
-            if any(genus_synset in path for path in syn.hypernym_paths()):
-                return syn
 
-    return None
+def guess_synset(term_en: str, defn_en: str) -> Optional[Synset]:
+    name = guess_synset_name(term_en, defn_en)
+    return en_wordnet.synset(name) if name else None
@@ -0,0 +1,130 @@
+from collections import OrderedDict, namedtuple
+from typing import Callable, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+
+SynsetNames = Tuple[str, ...]
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class SynsetCache:
+    def __init__(
+        self,
+        lookup: Callable[[str, str], SynsetNames],
+        max_entries: int = 50_000,
+        path: Optional[str] = None
+    ) -> None:
+        self.lookup = lookup
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, str], SynsetNames]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connect()
+
+    def _connect(self) -> None:
+        # WAL lets every worker of a pool read and extend the same file
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS synsets ("
+            "word TEXT NOT NULL, pos TEXT NOT NULL, names TEXT NOT NULL, "
+            "PRIMARY KEY (word, pos))"
+        )
+        self._conn.commit()
+        self._pid = os.getpid()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # A connection inherited through fork must not be used by the child
+        if self._conn is not None and self._pid != os.getpid():
+            self._connect()
+        return self._conn
+
+    def _remember(self, key: Tuple[str, str], names: SynsetNames) -> None:
+        self._entries[key] = names
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, word: str, pos: str) -> Optional[SynsetNames]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute(
+            "SELECT names FROM synsets WHERE word = ? AND pos = ?", (word, pos)
+        ).fetchone()
+        if row is None:
+            return None
+        return tuple(row[0].split()) if row[0] else ()
+
+    def _store(self, word: str, pos: str, names: SynsetNames) -> None:
+        conn = self._connection()
+        if conn is None:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO synsets (word, pos, names) VALUES (?, ?, ?)",
+            (word, pos, " ".join(names))
+        )
+        conn.commit()
+
+    def get(self, word: str, pos: str = 'n') -> SynsetNames:
+        key = (word, pos)
+        with self._lock:
+            names = self._entries.get(key)
+            if names is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return names
+
+            names = self._load(word, pos)
+            if names is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                names = self.lookup(word, pos)
+                self._store(word, pos, names)
+            self._remember(key, names)
+            return names
+
+    def cache_info(self) -> CacheInfo:
+        # Same shape as functools.lru_cache, disk hits count as hits
+        return CacheInfo(self.hits + self.disk_hits, self.misses,
+                          self.max_entries, len(self._entries))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def synset_cache_from_env(lookup: Callable[[str, str], SynsetNames]) -> SynsetCache:
+    path = os.getenv("SYNSET_CACHE")
+    cache = SynsetCache(
+        lookup,
+        max_entries=int(os.getenv("SYNSET_CACHE_SIZE", "50000")),
+        path=path if path and path.lower() not in ("none", "off") else None
+    )
+    if cache.path:
+        logging.info(f"Using persistent synset cache at '{cache.path}'")
+    return cache
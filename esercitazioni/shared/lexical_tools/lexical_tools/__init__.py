@@ -0,0 +1,24 @@
+from typing import Any
+import importlib
+
+# Resolved on first use, so python -m lexical_tools.wordnet_index and
+# python -m lexical_tools.preprocessing do not find their module already imported
+_EXPORTS = {
+    "WordNetIndex": "lexical_tools.wordnet_index",
+    "build_wordnet_index": "lexical_tools.wordnet_index",
+    "get_wordnet_index": "lexical_tools.wordnet_index",
+    "Translator": "lexical_tools.translation",
+    "TranslationCache": "lexical_tools.translation",
+    "translator_from_env": "lexical_tools.translation",
+    "Preprocessor": "lexical_tools.preprocessing",
+    "ensure_nltk_resources": "lexical_tools.preprocessing",
+    "get_preprocessor": "lexical_tools.preprocessing",
+    "preprocess_text": "lexical_tools.preprocessing",
+    "preprocess_texts": "lexical_tools.preprocessing",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'lexical_tools' has no attribute '{name}'")
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
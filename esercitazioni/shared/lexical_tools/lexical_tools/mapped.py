@@ -0,0 +1,77 @@
+from array import array
+from typing import Dict, List, Optional, Sequence
+import mmap
+import os
+
+
+def write_column(directory: str, name: str, values: array) -> None:
+    with open(os.path.join(directory, f"{name}.bin"), "wb") as file:
+        values.tofile(file)
+
+
+def write_strings(directory: str, name: str, strings: Sequence[str]) -> None:
+    offsets = array("Q", [0])
+    encoded = []
+    for string in strings:
+        data = string.encode("utf-8")
+        encoded.append(data)
+        offsets.append(offsets[-1] + len(data))
+    with open(os.path.join(directory, f"{name}.bin"), "wb") as file:
+        file.write(b"".join(encoded))
+    write_column(directory, f"{name}_offsets", offsets)
+
+
+class MappedColumns:
+    def __init__(self, directory: str, columns: Dict[str, str]) -> None:
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+        self._columns: Dict[str, memoryview] = {}
+        for name, typecode in columns.items():
+            view = self._map(os.path.join(directory, f"{name}.bin"))
+            self._columns[name] = view if typecode == "B" else view.cast(typecode)
+
+    def _map(self, path: str) -> memoryview:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b"")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        self._maps.append(mapped)
+        self._views.append(view)
+        return view
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self._columns[name]
+
+    def string(self, name: str, position: int) -> str:
+        offsets = self._columns[f"{name}_offsets"]
+        return bytes(self._columns[name][offsets[position]:offsets[position + 1]]
+                     ).decode("utf-8")
+
+    def find_string(self, name: str, key: str) -> Optional[int]:
+        # String tables are written sorted, so lookups are a binary search
+        offsets = self._columns[f"{name}_offsets"]
+        strings = self._columns[name]
+        target = key.encode("utf-8")
+        low, high = 0, len(offsets) - 1
+        size = high
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(strings[offsets[middle]:offsets[middle + 1]]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < size and bytes(strings[offsets[low]:offsets[low + 1]]) == target:
+            return low
+        return None
+
+    def close(self) -> None:
+        for column in self._columns.values():
+            column.release()
+        for view in self._views:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._columns = {}
+        self._views = []
+        self._maps = []
@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+import argparse
+import logging
+import random
+import time
+
+from lexical_tools.wordnet_index import get_wordnet_index
+
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+
+_available: Set[str] = set()
+
+
+def ensure_nltk_resources(*names: str) -> None:
+    # Each resource is looked up once per process, and downloaded only if missing
+    import nltk
+
+    for name in names:
+        if name in _available:
+            continue
+        try:
+            nltk.data.find(NLTK_RESOURCES[name])
+        except LookupError:
+            logging.info(f"Downloading NLTK resource '{name}'")
+            nltk.download(name, quiet=True)
+        _available.add(name)
+
+
+class Preprocessor:
+    def __init__(self, language: str = "english", max_lemmas: int = 100_000) -> None:
+        self.language = language
+        self.max_lemmas = max_lemmas
+        self.texts = 0
+        self.tokens = 0
+        self.lemma_hits = 0
+        self.lemma_misses = 0
+        self._lemmas: 'OrderedDict[str, str]' = OrderedDict()
+        self._stop_words: Optional[Set[str]] = None
+        self._tokenize: Optional[Callable[[str], List[str]]] = None
+        self._lemmatize: Optional[Callable[[str], str]] = None
+
+    @property
+    def stop_words(self) -> Set[str]:
+        if self._stop_words is None:
+            ensure_nltk_resources("stopwords")
+            from nltk.corpus import stopwords
+
+            self._stop_words = set(stopwords.words(self.language))
+        return self._stop_words
+
+    def tokenize(self, text: str) -> List[str]:
+        if self._tokenize is None:
+            ensure_nltk_resources("punkt", "punkt_tab")
+            from nltk.tokenize import word_tokenize
+
+            self._tokenize = word_tokenize
+        return self._tokenize(text)
+
+    def _lemmatizer(self) -> Callable[[str], str]:
+        if self._lemmatize is None:
+            index = get_wordnet_index()
+            if index is not None:
+                self._lemmatize = index.lemmatize
+            else:
+                ensure_nltk_resources("wordnet")
+                from nltk.stem import WordNetLemmatizer
+
+                self._lemmatize = WordNetLemmatizer().lemmatize
+        return self._lemmatize
+
+    def lemma(self, token: str) -> str:
+        lemma = self._lemmas.get(token)
+        if lemma is not None:
+            self.lemma_hits += 1
+            self._lemmas.move_to_end(token)
+            return lemma
+        self.lemma_misses += 1
+        lemma = self._lemmas[token] = self._lemmatizer()(token)
+        if len(self._lemmas) > self.max_lemmas:
+            self._lemmas.popitem(last=False)
+        return lemma
+
+    def content_tokens(self, text: str) -> List[str]:
+        tokens = self.tokenize(text.lower())
+        self.texts += 1
+        self.tokens += len(tokens)
+        stop_words = self.stop_words
+        return [token for token in tokens if token.isalpha() and token not in stop_words]
+
+    def preprocess(self, text: str) -> str:
+        return " ".join(self.lemma(token) for token in self.content_tokens(text))
+
+    def preprocess_many(self, texts: Sequence[str]) -> List[str]:
+        # Each distinct text is tokenized once and each distinct token lemmatized once
+        unique = {text: self.content_tokens(text) for text in dict.fromkeys(texts)}
+        processed = {text: " ".join(self.lemma(token) for token in tokens)
+                     for text, tokens in unique.items()}
+        return [processed[text] for text in texts]
+
+    def reset_stats(self) -> None:
+        self.texts = self.tokens = 0
+        self.lemma_hits = self.lemma_misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "texts": self.texts,
+            "tokens": self.tokens,
+            "lemma_types": len(self._lemmas),
+            "lemma_hits": self.lemma_hits,
+            "lemma_misses": self.lemma_misses,
+        }
+
+
+_preprocessor: Optional[Preprocessor] = None
+
+
+def get_preprocessor() -> Preprocessor:
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = Preprocessor()
+    return _preprocessor
+
+
+def preprocess_text(text: str) -> str:
+    return get_preprocessor().preprocess(text)
+
+
+def preprocess_texts(texts: Sequence[str]) -> List[str]:
+    return get_preprocessor().preprocess_many(texts)
+
+
+def synthetic_definitions(size: int, seed: int = 0) -> List[str]:
+    # Noun glosses of WordNet, sampled with replacement and with their words shuffled
+    ensure_nltk_resources("wordnet")
+    from nltk.corpus import wordnet
+
+    rng = random.Random(seed)
+    glosses = [synset.definition() for synset in wordnet.all_synsets("n")]
+    definitions = []
+    for _ in range(size):
+        words = rng.choice(glosses).split()
+        rng.shuffle(words)
+        definitions.append(" ".join(words))
+    return definitions
+
+
+def run_bench(size: int, seed: int = 0) -> Dict[str, float]:
+    definitions = synthetic_definitions(size, seed)
+
+    # Token by token as the load_data modules used to do, without memoization
+    preprocessor = Preprocessor()
+    ensure_nltk_resources("wordnet")
+    from nltk.stem import WordNetLemmatizer
+
+    lemmatizer = WordNetLemmatizer()
+    lemmatizer.lemmatize("warm")
+    preprocessor.preprocess("warm up")
+    preprocessor.reset_stats()
+    start = time.perf_counter()
+    baseline = [" ".join(lemmatizer.lemmatize(token)
+                         for token in preprocessor.content_tokens(text))
+                for text in definitions]
+    baseline_s = time.perf_counter() - start
+    # Counted over every text, the batched pass only tokenizes the distinct ones
+    tokens = preprocessor.tokens
+
+    preprocessor = Preprocessor()
+    preprocessor.preprocess("warm up")
+    start = time.perf_counter()
+    batched = preprocessor.preprocess_many(definitions)
+    batched_s = time.perf_counter() - start
+
+    result = {
+        "definitions": size,
+        "tokens": tokens,
+        "baseline_s": baseline_s,
+        "batched_s": batched_s,
+        "baseline_tokens_per_s": tokens / baseline_s,
+        "batched_tokens_per_s": tokens / batched_s,
+        "same_output": baseline == batched,
+    }
+    logging.info(f"{size} definitions, {tokens} tokens: "
+                 f"{result['baseline_tokens_per_s']:.0f} tokens/s token by token, "
+                 f"{result['batched_tokens_per_s']:.0f} tokens/s batched "
+                 f"({baseline_s / batched_s:.1f}x), same output: {result['same_output']}")
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tokenization and lemmatization throughput")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000",
+                        help="Comma separated corpus sizes, in definitions")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the synthetic corpus")
+    return parser.parse_args()
+
+
+def main(sizes: Iterable[int], seed: int = 0) -> None:
+    for size in sizes:
+        run_bench(size, seed)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.seed)
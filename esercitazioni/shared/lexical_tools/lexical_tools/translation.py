@@ -0,0 +1,227 @@
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+SEPARATOR = "\n"
+
+
+def make_translation_key(source: str, target: str, text: str) -> str:
+    payload = json.dumps([source.lower(), target.lower(), text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationBackend(Protocol):
+    name: str
+    calls: int
+
+    def translate_batch(self, texts: Sequence[str], source: str,
+                        target: str) -> List[Optional[str]]:
+        ...
+
+
+def chunk_texts(texts: Sequence[str], max_chars: int,
+                max_items: Optional[int] = None) -> Iterable[List[str]]:
+    chunk: List[str] = []
+    size = 0
+    for text in texts:
+        if chunk and (size + len(text) + len(SEPARATOR) > max_chars
+                      or (max_items is not None and len(chunk) >= max_items)):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text) + len(SEPARATOR)
+    if chunk:
+        yield chunk
+
+
+class GoogleBackend:
+    name = "google"
+
+    def __init__(self, max_chars: int = 4500, max_items: int = 100,
+                 retries: int = 2, backoff: float = 1.0) -> None:
+        from deep_translator import GoogleTranslator
+
+        self._translator_class = GoogleTranslator
+        self.max_chars = max_chars
+        self.max_items = max_items
+        self.retries = retries
+        self.backoff = backoff
+        self.calls = 0
+
+    def _translate(self, text: str, source: str, target: str) -> Optional[str]:
+        for attempt in range(self.retries + 1):
+            self.calls += 1
+            try:
+                return self._translator_class(source=source, target=target).translate(text)
+            except Exception as e:
+                if attempt == self.retries:
+                    logging.warning(f"Translation failed for text: {text}. Error: {e}")
+                    return None
+                time.sleep(self.backoff * 2 ** attempt)
+        return None
+
+    def translate_batch(self, texts: Sequence[str], source: str,
+                        target: str) -> List[Optional[str]]:
+        translations: List[Optional[str]] = []
+        # One request carries as many lines as fit in Google's size limit
+        for chunk in chunk_texts([" ".join(text.split()) for text in texts],
+                                 self.max_chars, self.max_items):
+            joined = self._translate(SEPARATOR.join(chunk), source, target)
+            lines = joined.split(SEPARATOR) if joined is not None else []
+            if len(lines) == len(chunk):
+                translations.extend(line.strip() for line in lines)
+            else:
+                if joined is not None:
+                    logging.warning(f"Batch of {len(chunk)} texts came back as "
+                                    f"{len(lines)} lines, translating one by one")
+                translations.extend(self._translate(text, source, target)
+                                    for text in chunk)
+        return translations
+
+
+class DictionaryBackend:
+    name = "dictionary"
+
+    def __init__(self, path: str) -> None:
+        # JSON object mapping source texts to their translations
+        with open(path, encoding="utf-8") as file:
+            self.entries: Dict[str, str] = json.load(file)
+        self.calls = 0
+
+    def translate_batch(self, texts: Sequence[str], source: str,
+                        target: str) -> List[Optional[str]]:
+        self.calls += 1
+        return [self.entries.get(text, self.entries.get(text.lower()))
+                for text in texts]
+
+
+class TranslationCache:
+    def __init__(self, path: str = "rsrc/translations.sqlite") -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, translation TEXT NOT NULL, "
+            "backend TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, translation FROM translations "
+                    f"WHERE key IN ({placeholders})", batch
+                ).fetchall())
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, str], backend: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation, backend, created) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, translation, backend, now) for key, translation in entries.items()]
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Translator:
+    def __init__(
+        self,
+        backend: Optional[TranslationBackend],
+        cache: Optional[TranslationCache] = None,
+        source: str = "it",
+        target: str = "en"
+    ) -> None:
+        self.backend = backend
+        self.cache = cache
+        self.source = source
+        self.target = target
+        self.translated = 0
+        self.failed = 0
+
+    def translate(self, texts: Sequence[str]) -> List[str]:
+        unique = list(dict.fromkeys(texts))
+        keys = {text: make_translation_key(self.source, self.target, text)
+                for text in unique}
+
+        translations: Dict[str, str] = {text: text for text in unique if not text.strip()}
+        if self.cache is not None:
+            cached = self.cache.get_many([keys[text] for text in unique
+                                          if text not in translations])
+            translations.update({text: cached[key] for text, key in keys.items()
+                                 if key in cached})
+
+        missing = [text for text in unique if text not in translations]
+        if missing and self.backend is not None:
+            results = self.backend.translate_batch(missing, self.source, self.target)
+            fresh = {text: result for text, result in zip(missing, results)
+                     if result is not None}
+            translations.update(fresh)
+            self.translated += len(fresh)
+            if self.cache is not None and fresh:
+                self.cache.put_many({keys[text]: result for text, result in fresh.items()},
+                                    self.backend.name)
+
+        # Texts that could not be translated are kept as they are, and not cached
+        self.failed += sum(1 for text in unique if text not in translations)
+        return [translations.get(text, text) for text in texts]
+
+    def translate_one(self, text: str) -> str:
+        return self.translate([text])[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cache_hits": self.cache.hits if self.cache is not None else 0,
+            "translated": self.translated,
+            "failed": self.failed,
+            "backend_calls": self.backend.calls if self.backend is not None else 0,
+        }
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
+
+
+def translator_from_env(source: str = "it", target: str = "en") -> Translator:
+    backend_name = os.getenv("TRANSLATION_BACKEND", "google").strip().lower()
+    backend: Optional[TranslationBackend]
+    if backend_name == "google":
+        backend = GoogleBackend(max_items=int(os.getenv("TRANSLATION_BATCH_SIZE", "100")),
+                                retries=int(os.getenv("TRANSLATION_RETRIES", "2")))
+    elif backend_name == "dictionary":
+        backend = DictionaryBackend(os.getenv("TRANSLATION_DICTIONARY",
+                                              "rsrc/translations.json"))
+    elif backend_name in ("", "none", "off"):
+        backend = None
+    else:
+        raise ValueError(f"Unknown translation backend '{backend_name}'")
+
+    cache_path = os.getenv("TRANSLATION_CACHE", "rsrc/translations.sqlite")
+    cache = None if cache_path.lower() in ("", "none", "off") else TranslationCache(cache_path)
+    return Translator(backend, cache, source=source, target=target)
@@ -0,0 +1,214 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional
+import argparse
+import json
+import logging
+import os
+import time
+
+from lexical_tools.mapped import MappedColumns, write_column, write_strings
+
+INDEX_VERSION = 2
+POS_LIST = "nvar"
+
+# Same detachment rules NLTK's morphy applies when a form is not an exception
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    "n": [("s", ""), ("ses", "s"), ("ves", "f"), ("xes", "x"), ("zes", "z"),
+          ("ches", "ch"), ("shes", "sh"), ("men", "man"), ("ies", "y")],
+    "v": [("s", ""), ("ies", "y"), ("es", "e"), ("es", ""), ("ed", "e"),
+          ("ed", ""), ("ing", "e"), ("ing", "")],
+    "a": [("er", ""), ("est", ""), ("er", "e"), ("est", "e")],
+    "r": [],
+}
+
+# name -> array typecode of every column file in the index directory
+COLUMNS = {
+    "synsets": "B",
+    "synsets_offsets": "Q",
+    "definitions": "B",
+    "definitions_offsets": "Q",
+    "forms": "B",
+    "forms_offsets": "Q",
+    "words": "B",
+    "words_offsets": "Q",
+    "form_indptr": "Q",
+    "form_synsets": "I",
+    "ancestor_indptr": "Q",
+    "ancestors": "I",
+}
+
+
+def build_wordnet_index(index_dir: str) -> None:
+    from nltk.corpus import wordnet as wn
+
+    start_time = time.perf_counter()
+    synsets = sorted(wn.all_synsets(), key=lambda synset: synset.name())
+    synset_ids = {(synset.pos(), synset.offset()): i for i, synset in enumerate(synsets)}
+    # Satellite adjectives are listed under 'a' in index.adj
+    for (pos, offset), synset_id in list(synset_ids.items()):
+        if pos == "s":
+            synset_ids[("a", offset)] = synset_id
+
+    forms = sorted(wn._lemma_pos_offset_map)
+    form_indptr = array("Q", [0])
+    form_synsets = array("I")
+    for form in forms:
+        offsets = wn._lemma_pos_offset_map[form]
+        for pos in POS_LIST:
+            form_synsets.extend(synset_ids[(pos, offset)]
+                                for offset in offsets.get(pos, []))
+            form_indptr.append(len(form_synsets))
+
+    closures: Dict[int, List[int]] = {}
+
+    def closure(synset_id: int) -> List[int]:
+        if synset_id not in closures:
+            synset = synsets[synset_id]
+            ancestors = {synset_id}
+            for parent in synset.hypernyms() + synset.instance_hypernyms():
+                ancestors.update(closure(synset_ids[(parent.pos(), parent.offset())]))
+            closures[synset_id] = sorted(ancestors)
+        return closures[synset_id]
+
+    ancestor_indptr = array("Q", [0])
+    ancestors = array("I")
+    for synset_id in range(len(synsets)):
+        ancestors.extend(closure(synset_id))
+        ancestor_indptr.append(len(ancestors))
+
+    words = sorted({lemma.name() for synset in synsets for lemma in synset.lemmas()})
+
+    os.makedirs(index_dir, exist_ok=True)
+    write_strings(index_dir, "synsets", [synset.name() for synset in synsets])
+    write_strings(index_dir, "definitions", [synset.definition() for synset in synsets])
+    write_strings(index_dir, "forms", forms)
+    write_strings(index_dir, "words", words)
+    write_column(index_dir, "form_indptr", form_indptr)
+    write_column(index_dir, "form_synsets", form_synsets)
+    write_column(index_dir, "ancestor_indptr", ancestor_indptr)
+    write_column(index_dir, "ancestors", ancestors)
+
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump({
+            "version": INDEX_VERSION,
+            "wordnet": wn.get_version(),
+            "synsets": len(synsets),
+            "forms": len(forms),
+            "words": len(words),
+            "exceptions": {pos: wn._exception_map[pos] for pos in POS_LIST},
+        }, file)
+
+    logging.info(f"Indexed {len(synsets)} synsets, {len(forms)} lemma forms and "
+                 f"{len(ancestors)} ancestor links in '{index_dir}' in "
+                 f"{time.perf_counter() - start_time:.1f}s")
+
+
+class WordNetIndex:
+    def __init__(self, index_dir: str) -> None:
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported WordNet index version in '{index_dir}'")
+
+        self.version = meta["wordnet"]
+        self.size = meta["synsets"]
+        self._exceptions: Dict[str, Dict[str, List[str]]] = meta["exceptions"]
+        self._columns = MappedColumns(index_dir, COLUMNS)
+
+    def _form_synsets(self, form: str, pos: str) -> memoryview:
+        position = self._columns.find_string("forms", form)
+        if position is None:
+            return memoryview(b"").cast("I")
+        slot = 4 * position + POS_LIST.index(pos)
+        indptr = self._columns["form_indptr"]
+        return self._columns["form_synsets"][indptr[slot]:indptr[slot + 1]]
+
+    def morphy(self, form: str, pos: str) -> List[str]:
+        exceptions = self._exceptions[pos]
+        if form in exceptions:
+            forms = exceptions[form]
+        else:
+            forms = [form[:-len(old)] + new
+                     for old, new in MORPHOLOGICAL_SUBSTITUTIONS[pos]
+                     if form.endswith(old)]
+
+        result = []
+        for candidate in [form] + forms:
+            if candidate not in result and len(self._form_synsets(candidate, pos)):
+                result.append(candidate)
+        return result
+
+    def lemmatize(self, word: str, pos: str = "n") -> str:
+        lemmas = self.morphy(word, pos)
+        return min(lemmas, key=len) if lemmas else word
+
+    def synset_ids(self, lemma: str, pos: Optional[str] = None) -> List[int]:
+        lemma = lemma.lower()
+        ids: List[int] = []
+        for p in (POS_LIST if pos is None else pos):
+            for form in self.morphy(lemma, p):
+                ids.extend(self._form_synsets(form, p).tolist())
+        return ids
+
+    def synsets(self, lemma: str, pos: Optional[str] = None) -> List[str]:
+        return [self.name(synset_id) for synset_id in self.synset_ids(lemma, pos)]
+
+    def name(self, synset_id: int) -> str:
+        return self._columns.string("synsets", synset_id)
+
+    def find(self, name: str) -> Optional[int]:
+        return self._columns.find_string("synsets", name)
+
+    def definition(self, synset_id: int) -> str:
+        return self._columns.string("definitions", synset_id)
+
+    def ancestors(self, synset_id: int) -> memoryview:
+        indptr = self._columns["ancestor_indptr"]
+        return self._columns["ancestors"][indptr[synset_id]:indptr[synset_id + 1]]
+
+    def is_ancestor(self, ancestor_id: int, synset_id: int) -> bool:
+        # Closures contain the synset itself, like the paths of hypernym_paths()
+        closure = self.ancestors(synset_id)
+        position = bisect_left(closure, ancestor_id)
+        return position < len(closure) and closure[position] == ancestor_id
+
+    def words(self) -> Iterator[str]:
+        for position in range(len(self._columns["words_offsets"]) - 1):
+            yield self._columns.string("words", position)
+
+    def lemma_names(self, pos: str) -> Iterator[str]:
+        # Same forms as wn.all_lemma_names(pos), in sorted order
+        indptr = self._columns["form_indptr"]
+        slot = POS_LIST.index(pos)
+        for position in range(len(self._columns["forms_offsets"]) - 1):
+            if indptr[4 * position + slot + 1] > indptr[4 * position + slot]:
+                yield self._columns.string("forms", position)
+
+    def close(self) -> None:
+        self._columns.close()
+
+
+_index: Optional[WordNetIndex] = None
+
+
+def get_wordnet_index() -> Optional[WordNetIndex]:
+    global _index
+    index_dir = os.getenv("WORDNET_INDEX")
+    if _index is None and index_dir and os.path.exists(os.path.join(index_dir, "meta.json")):
+        _index = WordNetIndex(index_dir)
+        logging.info(f"Using WordNet index at '{index_dir}' ({_index.size} synsets)")
+    return _index
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Prebuilt WordNet lemma and hypernym index")
+    parser.add_argument("index_dir", nargs="?", default=os.getenv("WORDNET_INDEX", "wordnet_index"),
+                        help="Directory the index is written to")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    build_wordnet_index(parse_args().index_dir)
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.cache import SenseCache
+from src.client import BabelNetClient
+from src.pipeline import stream_map
+from src.saving import PseudowordStore
+from src.standin import StandInConfig, serve
+
+
+def setup_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Load benchmark of process_word_tuple against a BabelNet stand-in")
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='Comma separated numbers of tuples to process')
+    parser.add_argument('--langs', default='EN,IT')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', default=None,
+                        help='Benchmark an already running server instead')
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help='Server side requests per second before answering 429')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rate', type=float, default=10_000.0,
+                        help='Client side token bucket rate')
+    parser.add_argument('--in-flight', type=int, default=None)
+    parser.add_argument('--unique-lemmas', type=int, default=None,
+                        help='Draw tuples from this many lemmas to exercise the cache')
+    parser.add_argument('--cache', action='store_true',
+                        help='Run the client with a fresh on-disk SenseCache')
+    parser.add_argument('--expand', action='store_true',
+                        help='Query every word of each tuple (multi-lemma mode)')
+    parser.add_argument('--output', default=None,
+                        help='Write the results as JSON to this file')
+    return parser.parse_args()
+
+
+def synthetic_tuples(size: int, langs: List[str], unique: Optional[int]
+                     ) -> List[Tuple[str, ...]]:
+    pool = unique or size
+    return [tuple(f'{lang.lower()}word{i % pool}' for lang in langs)
+            for i in range(size)]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.05)
+    raise TimeoutError(f"Stand-in server did not start on port {port}")
+
+
+async def drive(word_tuples: List[Tuple[str, ...]], langs: List[str], url: str,
+                concurrency: int, rate: float, in_flight: int,
+                cache: Optional[SenseCache], store: PseudowordStore,
+                expand: bool) -> Dict[str, float]:
+    # Imported here so that spawned workers pay for matplotlib only once per size
+    from main import process_word_tuple_wrapper
+
+    latencies: List[float] = []
+
+    async def timed(words: Tuple[str, ...]) -> Optional[dict]:
+        start = time.perf_counter()
+        result = await process_word_tuple_wrapper(words, langs, client, store, expand)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    completed = 0
+    async with BabelNetClient('benchmark', cache=cache, concurrency=concurrency,
+                              rate=rate, burst=rate, url=url) as client:
+        start = time.perf_counter()
+        async for _, result in stream_map(timed, word_tuples, in_flight):
+            if result:
+                completed += 1
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'elapsed': elapsed,
+        'completed': completed,
+        'failed': len(word_tuples) - completed,
+        'throughput': len(word_tuples) / elapsed if elapsed else 0.0,
+        'p50_ms': 1000 * statistics.median(latencies) if latencies else 0.0,
+        'p99_ms': 1000 * latencies[min(len(latencies) - 1,
+                                       int(0.99 * len(latencies)))] if latencies else 0.0,
+        'requests': client.requests_sent,
+        'retries': client.retries,
+        'deduplicated': client.deduplicated,
+        'memo_hits': client.memo_hits,
+    }
+
+
+def run_size(size: int, langs: List[str], url: str, concurrency: int, rate: float,
+             in_flight: int, unique: Optional[int], use_cache: bool,
+             expand: bool) -> Dict[str, float]:
+    logging.disable(logging.WARNING)
+    word_tuples = synthetic_tuples(size, langs, unique)
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = SenseCache(os.path.join(workdir, 'cache.sqlite'),
+                           max_entries=None) if use_cache else None
+        with PseudowordStore(os.path.join(workdir, 'pseudowords')) as store:
+            metrics = asyncio.run(drive(word_tuples, langs, url, concurrency, rate,
+                                        in_flight, cache, store, expand))
+        if cache is not None:
+            metrics.update({f'cache_{k}': v for k, v in cache.stats().items()})
+            cache.close()
+
+    metrics['size'] = size
+    metrics['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return metrics
+
+
+def main() -> None:
+    args = parse_args()
+    setup_logging()
+
+    langs = [lang.strip().upper() for lang in args.langs.split(',')]
+    sizes = [int(size) for size in args.sizes.split(',')]
+    in_flight = args.in_flight or 2 * args.concurrency
+    context = multiprocessing.get_context('spawn')
+
+    server = None
+    url = args.url
+    if url is None:
+        config = StandInConfig(latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, rate_limit=args.rate_limit)
+        server = context.Process(target=serve, args=(config, '127.0.0.1', args.port),
+                                 daemon=True)
+        server.start()
+        wait_for_port(args.port)
+        url = f'http://127.0.0.1:{args.port}/v9/getSenses'
+
+    results = []
+    try:
+        for size in sizes:
+            # A fresh process per size keeps peak RSS comparable between runs
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                metrics = executor.submit(run_size, size, langs, url, args.concurrency,
+                                          args.rate, in_flight, args.unique_lemmas,
+                                          args.cache, args.expand).result()
+            results.append(metrics)
+            logging.info(
+                f"{size} tuples: {metrics['throughput']:.1f} tuples/s, "
+                f"p50 {metrics['p50_ms']:.1f} ms, p99 {metrics['p99_ms']:.1f} ms, "
+                f"peak RSS {metrics['peak_rss_mb']:.1f} MB, "
+                f"{metrics['requests']} requests, {metrics['failed']} failed, "
+                f"{metrics['retries']} retries"
+            )
+    except KeyboardInterrupt:
+        logging.info("Exiting!")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+        logging.info(f"Saved benchmark results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
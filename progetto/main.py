@@ -1,16 +1,25 @@
+import argparse
+import asyncio
 import csv
-import concurrent.futures
 import logging
 import os
-from functools import partial
-from typing import Dict, List, Optional, Set, Tuple
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from dotenv import find_dotenv, load_dotenv
-import matplotlib.pyplot as plt
 import numpy as np
+from dotenv import find_dotenv, load_dotenv
 
-from src.babelnet import get_sense
-from src.saving import save_ambiguities, save_pseudoword
+from src.cache import SenseCache, cache_from_env
+from src.checkpoint import (CheckpointJournal, drop_unsaved, entry_matches,
+                            read_journal)
+from src.client import BabelNetClient, QuotaExceeded, client_from_env
+from src.pipeline import stream_map
+from src.report import write_report
+from src.scoring import SubsetScores, encode_synsets, score_subsets
+from src.senses import SenseIndex
+from src.saving import (AMBIGUITIES_FILE, PseudowordStore, ScoreWriter,
+                        load_ambiguities, save_ambiguities, save_pseudoword,
+                        save_subset_scores)
 
 
 def setup_logging() -> None:
@@ -20,6 +29,47 @@ def setup_logging() -> None:
     )
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Multilingual ambiguity reduction")
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip tuples already recorded in the checkpoint journal'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        default='rsrc/checkpoint.jsonl',
+        help='Path of the append-only checkpoint journal'
+    )
+    parser.add_argument(
+        '--rescore',
+        action='store_true',
+        help='Re-score the journaled synsets for every language subset, offline'
+    )
+    parser.add_argument(
+        '--rescore-output',
+        default='rsrc/rescored_ambiguities.parquet',
+        help='Parquet file written by --rescore'
+    )
+    parser.add_argument(
+        '--report-dir',
+        default=None,
+        help='Directory for the plots and aggregated scores (default rsrc/report, '
+             'or <rescore-output>_report with --rescore)'
+    )
+    parser.add_argument(
+        '--overwrite',
+        action='store_true',
+        help='Replace the sense files of a previous run instead of refusing to start'
+    )
+    parser.add_argument(
+        '--expand',
+        action='store_true',
+        help='Query every word of a tuple in its own language instead of only the first'
+    )
+    return parser.parse_args()
+
+
 def check_dotenv(dotenv_path: Optional[str]) -> None:
     if dotenv_path:
         load_dotenv(dotenv_path)
@@ -28,66 +78,63 @@ def check_dotenv(dotenv_path: Optional[str]) -> None:
         logging.error("No .env file found.")
 
 
-def load_word_tuples(filepath: str) -> List[Tuple[str, ...]]:
-    tuples = []
+def load_word_tuples(filepath: str) -> Iterator[Tuple[str, ...]]:
     try:
         with open(filepath, newline='', encoding='utf-8') as file:
             reader = csv.reader(file)
             for row in reader:
                 words = tuple(word.strip() for word in row if word.strip())
                 if len(words) >= 2:
-                    tuples.append(words)
+                    yield words
     except FileNotFoundError:
         logging.error(f"Input file not found: {filepath}")
         raise
     except Exception as e:
         logging.error(f"Error reading input file: {e}")
         raise
-    return tuples
-
 
-def find_synset_language_dict(synsets: List[dict]) -> Dict[str, Set[str]]:
-    lang_synsets: Dict[str, Set[str]] = {}
-    for synset in synsets:
-        props = synset.get('properties', {})
-        synset_id = props.get('synsetID', {}).get('id')
-        lang = props.get('language', '').upper()
-        if synset_id and lang:
-            lang_synsets.setdefault(lang, set()).add(synset_id)
-    return lang_synsets
 
+def matching_tuples(word_tuples: Iterable[Tuple[str, ...]], langs: List[str],
+                    counts: Dict[str, int]) -> Iterator[Tuple[str, ...]]:
+    for words in word_tuples:
+        counts['read'] += 1
+        if len(words) == len(langs):
+            yield words
+        else:
+            logging.warning(f"Skipping {words}: expected {len(langs)} words")
 
-def extract_lemma_for_lang(synsets: List[dict], synset_id: str, lang: str) -> str:
-    lang = lang.upper()
-    for synset in synsets:
-        props = synset.get('properties', {})
-        synset_id_prop = props.get('synsetID', {}).get('id')
-        synset_lang = props.get('language', '').upper()
-        if synset_id_prop == synset_id and synset_lang == lang:
-            lemma = props.get('lemma')
-            if lemma:
-                return lemma
-    return ''
 
+async def fetch_sense_index(words: Tuple[str, ...], langs: List[str],
+                            client: BabelNetClient, expand: bool = False
+                            ) -> Optional[SenseIndex]:
+    if not expand:
+        synsets = await client.get_sense(words[0], langs)
+        return SenseIndex.from_response(synsets) if synsets else None
 
-def save_pseudoword_multi(pseudoword: str, words: Tuple[str, ...], synsets: List[dict],
-                          common_synsets: Set[str], langs: List[str]) -> None:
-    save_pseudoword(pseudoword, '-'.join(words), synsets, common_synsets)
+    indexes = await asyncio.gather(*(client.get_sense_index(word, lang)
+                                     for word, lang in zip(words, langs)))
+    if not any(indexes):
+        return None
+    return SenseIndex(
+        sense
+        for index, lang in zip(indexes, langs) if index is not None
+        for sense in index.by_key.values() if sense.language == lang.upper()
+    )
 
 
-def process_word_tuple(words: Tuple[str, ...], langs: List[str], api_key: str
-                       ) -> Optional[dict]:
+async def process_word_tuple(words: Tuple[str, ...], langs: List[str],
+                             client: BabelNetClient, store: PseudowordStore,
+                             expand: bool = False) -> Optional[dict]:
     if len(words) != len(langs):
         logging.error(f"Word tuple and language list length mismatch: {words}, {langs}")
         return None
 
-    synsets = get_sense(words[0], langs, api_key)
-    if not synsets:
+    index = await fetch_sense_index(words, langs, client, expand)
+    if index is None:
         logging.warning(f"No synsets found for words: {words}")
         return None
 
-    lang_synsets = find_synset_language_dict(synsets)
-    synsets_sets = [lang_synsets.get(lang.upper(), set()) for lang in langs]
+    synsets_sets = [index.synsets_for(lang) for lang in langs]
 
     if not all(synsets_sets):
         logging.info(f"Missing synsets for some languages in {words}")
@@ -104,59 +151,100 @@ def process_word_tuple(words: Tuple[str, ...], langs: List[str], api_key: str
         ambiguity_reduction = (total_synsets_count - (common_len * langs_len)
                                ) / total_synsets_count
     pseudoword = '-'.join(words)
-    save_pseudoword_multi(pseudoword, words, synsets, common_synsets, langs)
+    save_pseudoword(pseudoword, words, langs, index, common_synsets, store)
 
     return {
         'pseudoword': pseudoword,
-        'ambiguity_reduction': round(ambiguity_reduction, 3)
+        'ambiguity_reduction': round(ambiguity_reduction, 3),
+        'synsets': {lang.upper(): sorted(s) for lang, s in zip(langs, synsets_sets)}
     }
 
 
-def plot_results(ambiguity_scores: List[dict]) -> None:
-    if not ambiguity_scores:
-        logging.warning("No data available for plotting.")
-        return
-
-    pseudowords = [result['pseudoword'] for result in ambiguity_scores]
-    scores = [result['ambiguity_reduction'] for result in ambiguity_scores]
-
-    sorted_indices = np.argsort(scores)
-    sorted_pseudowords = [pseudowords[i] for i in sorted_indices]
-    sorted_scores = [scores[i] for i in sorted_indices]
-
-    plt.figure(figsize=(12, 8))
-
-    y_pos = np.arange(len(sorted_pseudowords))
-    colors = plt.cm.viridis(np.linspace(0, 1, len(sorted_pseudowords)))
-
-    bars = plt.barh(y_pos, sorted_scores, color=colors)
-    plt.yticks(y_pos, sorted_pseudowords)
-    plt.xlabel('Ambiguity Reduction Score')
-    plt.title('Pseudoword Ambiguity Reduction Results')
-
-    for bar in bars:
-        width = bar.get_width()
-        plt.text(width, bar.get_y() + bar.get_height()/2,
-                 f'{width:.2f}',
-                 ha='left', va='center')
-
-    plt.tight_layout()
-
-    plot_filename = 'ambiguity_reduction_plot.png'
-    plt.savefig(plot_filename)
-    logging.info(f"Saved plot as {plot_filename}")
-
-
-def process_word_tuple_wrapper(words: Tuple[str, ...], langs: List[str], api_key: str
-                               ) -> Optional[dict]:
+async def process_word_tuple_wrapper(words: Tuple[str, ...], langs: List[str],
+                                     client: BabelNetClient, store: PseudowordStore,
+                                     expand: bool = False) -> Optional[dict]:
     try:
-        return process_word_tuple(words, langs, api_key)
+        return await process_word_tuple(words, langs, client, store, expand)
+    except QuotaExceeded:
+        raise
     except Exception as e:
         logging.error(f"Error processing {words}: {str(e)}")
         return None
 
 
+async def process_tuples(word_tuples: Iterable[Tuple[str, ...]], langs: List[str],
+                         client: BabelNetClient, store: PseudowordStore,
+                         writer: ScoreWriter, journal: CheckpointJournal,
+                         max_in_flight: int, expand: bool = False) -> None:
+    async def process(words: Tuple[str, ...]) -> Optional[dict]:
+        return await process_word_tuple_wrapper(words, langs, client, store, expand)
+
+    async for words, result in stream_map(process, word_tuples, max_in_flight):
+        if result:
+            journal.record(words, langs, result)
+            writer.write(score_entry(result))
+            logging.info(f"Completed {words} → Score:"
+                         f"{result['ambiguity_reduction']:.3f}")
+
+
+async def run(word_tuples: Iterable[Tuple[str, ...]], langs: List[str],
+              api_key: Optional[str], store: PseudowordStore, writer: ScoreWriter,
+              journal: CheckpointJournal, cache: Optional[SenseCache],
+              expand: bool = False) -> None:
+    async with client_from_env(api_key, cache) as client:
+        max_in_flight = int(os.getenv('BABELNET_IN_FLIGHT', str(2 * client.concurrency)))
+        try:
+            await process_tuples(word_tuples, langs, client, store, writer, journal,
+                                 max_in_flight, expand)
+        finally:
+            logging.info(f"BabelNet requests: {client.requests_sent} sent, "
+                         f"{client.retries} retried, {client.deduplicated} shared "
+                         f"in flight, {client.memo_hits} reused from this run")
+
+
+def rescore(checkpoint: str, langs: List[str], output: Optional[str] = None,
+            expand: bool = False) -> Tuple[List[str], List[SubsetScores]]:
+    pseudowords = []
+    entries = []
+    for entry in read_journal(checkpoint):
+        if entry.get('expand', False) != expand:
+            continue
+        synsets = entry.get('synsets', {})
+        if all(lang in synsets for lang in langs):
+            pseudowords.append(entry['pseudoword'])
+            entries.append(synsets)
+
+    if not entries:
+        logging.warning(f"No journaled tuples in {checkpoint} cover {langs}")
+        return [], []
+
+    start = time.perf_counter()
+    matrices, codes = encode_synsets(entries, langs)
+    results = score_subsets(matrices, langs)
+    logging.info(f"Scored {len(entries)} tuples ({len(codes)} distinct synsets) "
+                 f"for {len(results)} language subsets in "
+                 f"{time.perf_counter() - start:.2f}s")
+    if output:
+        save_subset_scores(pseudowords, results, output)
+    return pseudowords, results
+
+
+def report(pseudowords: List[str], scores: np.ndarray,
+           subset_results: List[SubsetScores], output_dir: str,
+           scores_file: str = AMBIGUITIES_FILE) -> None:
+    save_ambiguities(pseudowords, scores, scores_file)
+    write_report(pseudowords, scores, subset_results, output_dir)
+
+
+def score_entry(result: dict) -> dict:
+    return {
+        'pseudoword': result['pseudoword'],
+        'ambiguity_reduction': result['ambiguity_reduction']
+    }
+
+
 def main() -> None:
+    args = parse_args()
     setup_logging()
     dotenv_path = find_dotenv()
     check_dotenv(dotenv_path)
@@ -165,46 +253,76 @@ def main() -> None:
     input_file = os.getenv('WORD_PAIRS')
     langs_env = os.getenv('LANGUAGES')
 
-    if not API_KEY or not input_file or not langs_env:
+    if args.rescore:
+        if not langs_env:
+            logging.error("Required environment variables missing")
+            return
+        langs = [lang.strip().upper() for lang in langs_env.split(',')]
+        pseudowords, subset_results = rescore(args.checkpoint, langs,
+                                              args.rescore_output, args.expand)
+        # The last subset holds every language, as in a normal run
+        scores = subset_results[-1].scores if subset_results else np.empty(0)
+        # Next to --rescore-output, so a rescore never replaces the files of a real run
+        stem = os.path.splitext(args.rescore_output)[0]
+        report(pseudowords, scores, subset_results, args.report_dir or f"{stem}_report",
+               f"{stem}_scores.parquet")
+        return
+
+    try:
+        cache = cache_from_env()
+    except ValueError as e:
+        logging.error(str(e))
+        return
+    offline = cache is not None and cache.offline
+
+    if (not API_KEY and not offline) or not input_file or not langs_env:
         logging.error("Required environment variables missing")
         return
 
     langs = [lang.strip().upper() for lang in langs_env.split(',')]
-
     try:
-        word_tuples = load_word_tuples(input_file)
-        valid_tuples = [words for words in word_tuples if len(words) == len(langs)]
-        max_workers = min(4, os.cpu_count() or 1)
-        chunk_size = 50
-        ambiguity_scores = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            process_func = partial(process_word_tuple_wrapper,
-                                   langs=langs, api_key=API_KEY)
-
-            for i in range(0, len(valid_tuples), chunk_size):
-                chunk = valid_tuples[i:i + chunk_size]
-                future_to_tuple = {
-                    executor.submit(process_func, words): words
-                    for words in chunk
-                }
-
-                for future in concurrent.futures.as_completed(future_to_tuple):
-                    words = future_to_tuple[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            ambiguity_scores.append(result)
-                            logging.info(f"Completed {words} → Score:"
-                                         f"{result['ambiguity_reduction']:.3f}")
-                    except Exception as e:
-                        logging.error(f"Error processing {words}: {str(e)}")
+        store = PseudowordStore(append=args.resume, overwrite=args.overwrite)
+    except FileExistsError as e:
+        logging.error(f"{e}. Re-run with --resume to continue it or --overwrite "
+                      f"to replace it.")
+        if cache is not None:
+            cache.close()
+        return
 
+    counts = {'read': 0}
+    writer = ScoreWriter()
+    if args.resume:
+        drop_unsaved(args.checkpoint, langs, args.expand, store.saved)
+        for entry in read_journal(args.checkpoint):
+            if entry_matches(entry, langs, args.expand):
+                writer.write(score_entry(entry))
+    journal = CheckpointJournal(args.checkpoint, resume=args.resume, expand=args.expand)
+
+    try:
+        word_tuples = matching_tuples(load_word_tuples(input_file), langs, counts)
+        pending = journal.pending(word_tuples, langs)
+        asyncio.run(run(pending, langs, API_KEY, store, writer, journal, cache,
+                        args.expand))
+
+    except QuotaExceeded as e:
+        logging.error(f"Stopping early: {e}. Re-run with --resume to continue.")
+    except KeyboardInterrupt:
+        logging.info("Interrupted. Re-run with --resume to continue.")
     except Exception as e:
         logging.error(f"Fatal error: {str(e)}", exc_info=True)
     finally:
-        save_ambiguities(ambiguity_scores)
-        plot_results(ambiguity_scores)
-        logging.info(f"Processed {len(ambiguity_scores)}/{len(word_tuples)} tuples")
+        store.close()
+        journal.close()
+        writer.close()
+        pseudowords, scores = load_ambiguities(writer.filename)
+        report(pseudowords, scores, [], args.report_dir or 'rsrc/report')
+        logging.info(f"Processed {writer.count}/{counts['read']} tuples "
+                     f"({journal.skipped} resumed from checkpoint)")
+        if cache is not None:
+            stats = cache.stats()
+            logging.info(f"BabelNet cache: {stats['hits']} hits, "
+                         f"{stats['misses']} misses ({stats['entries']} entries)")
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -1,2 +1,2 @@
-from src.babelnet import get_sense
+from src.client import BabelNetClient
 from src.saving import save_ambiguities, save_pseudoword
@@ -1,51 +1,22 @@
-import logging
-from typing import Optional, Tuple, List, Set, Dict, Any
-import requests
+from typing import Optional, List, Dict, Any
 
+BABELNET_URL = 'https://babelnet.io/v9/getSenses'
 
-def get_sense(
+
+def build_params(
     lemma: str,
     targetLang: List[str],
-    key: str,
+    key: Optional[str],
     source: str = "WIKI"
-) -> Optional[List[Dict[str, Any]]]:
-    url = 'https://babelnet.io/v9/getSenses'
-    searchLang = targetLang[0]
-    params = {
+) -> Dict[str, Any]:
+    return {
         'lemma': lemma,
-        'searchLang': searchLang,
+        'searchLang': targetLang[0],
         'targetLang': targetLang,
         'key': key,
         'source': source
     }
 
-    response = requests.get(url, params=params, timeout=10)
-    try:
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching synsets: {e}")
-        return None
-
-
-def find_synset_language_dict(
-    synsets: List[Dict[str, Any]],
-    langs: List[str]
-) -> Tuple[Dict[str, Set[str]], Set[str]]:
-    lang_synsets: Dict[str, Set[str]] = {lang.upper(): set() for lang in langs}
-
-    for synset in synsets:
-        props = synset.get('properties', {})
-        synset_id = props.get('synsetID', {}).get('id')
-        lang = props.get('language', '').upper()
-
-        if synset_id and lang in lang_synsets:
-            lang_synsets[lang].add(synset_id)
-
-    synset_sets = [s for s in lang_synsets.values() if s]
-    if synset_sets:
-        common_synsets = set.intersection(*synset_sets)
-    else:
-        common_synsets = set()
 
-    return lang_synsets, common_synsets
+def is_error_payload(data: Any) -> bool:
+    return isinstance(data, dict) and 'message' in data
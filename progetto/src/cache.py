@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+CACHE_MODES = ('readwrite', 'readonly', 'offline')
+TOUCH_BATCH = 1000
+
+
+def make_cache_key(
+    lemma: str,
+    search_lang: str,
+    target_langs: List[str],
+    source: str
+) -> str:
+    payload = json.dumps([
+        lemma,
+        search_lang.upper(),
+        sorted({lang.upper() for lang in target_langs}),
+        source.upper()
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SenseCache:
+    def __init__(
+        self,
+        path: str = 'rsrc/babelnet_cache.sqlite',
+        ttl: Optional[float] = 30 * 24 * 3600,
+        max_entries: Optional[int] = 200_000,
+        mode: str = 'readwrite'
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+
+        if self.writable:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._create_schema()
+        elif os.path.exists(path):
+            # Read-only modes never write to the file, not even the schema
+            self._conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True,
+                                         check_same_thread=False)
+        else:
+            logging.warning(f"Cache file {path} does not exist, starting empty")
+            self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+            self._create_schema()
+        self._count = self._conn.execute('SELECT COUNT(*) FROM senses').fetchone()[0]
+
+    def _create_schema(self) -> None:
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS senses ('
+            'key TEXT PRIMARY KEY, payload TEXT NOT NULL, '
+            'created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS senses_accessed ON senses(accessed)')
+        self._conn.commit()
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == 'readwrite'
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == 'offline'
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, created FROM senses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                if self.writable:
+                    self._conn.execute('DELETE FROM senses WHERE key = ?', (key,))
+                    self._conn.commit()
+                    self._count -= 1
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if self.writable:
+                # Access times are written in batches, not on every hit
+                self._touched[key] = now
+                if len(self._touched) >= TOUCH_BATCH:
+                    self._flush_touched()
+                    self._conn.commit()
+        return json.loads(row[0])
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        self._conn.executemany(
+            'UPDATE senses SET accessed = ? WHERE key = ?',
+            [(accessed, key) for key, accessed in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def put(self, key: str, senses: List[Dict[str, Any]]) -> None:
+        if not self.writable:
+            return
+
+        now = time.time()
+        payload = json.dumps(senses, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            exists = self._conn.execute(
+                'SELECT 1 FROM senses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO senses (key, payload, created, accessed) '
+                'VALUES (?, ?, ?, ?)', (key, payload, now, now)
+            )
+            if not exists:
+                self._count += 1
+            self._touched.pop(key, None)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        if self.max_entries is None or self._count <= self.max_entries:
+            return
+        excess = self._count - self.max_entries
+        self._flush_touched()
+        self._conn.execute(
+            'DELETE FROM senses WHERE key IN '
+            '(SELECT key FROM senses ORDER BY accessed ASC LIMIT ?)', (excess,)
+        )
+        self._count -= excess
+        logging.info(f"Evicted {excess} least recently used cache entries")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': self._count}
+
+    def close(self) -> None:
+        with self._lock:
+            if self.writable:
+                self._flush_touched()
+                self._conn.commit()
+            self._conn.close()
+
+
+def cache_from_env() -> Optional[SenseCache]:
+    path = os.getenv('BABELNET_CACHE', 'rsrc/babelnet_cache.sqlite')
+    if path.lower() in ('', 'none', 'off'):
+        return None
+
+    ttl_env = os.getenv('BABELNET_CACHE_TTL')
+    max_entries_env = os.getenv('BABELNET_CACHE_MAX_ENTRIES')
+    mode = os.getenv('BABELNET_CACHE_MODE', 'readwrite').strip().lower()
+    if mode not in CACHE_MODES:
+        # A typo must not turn an offline run into one that spends the quota
+        raise ValueError(f"Unknown BABELNET_CACHE_MODE '{mode}', expected one of "
+                         f"{CACHE_MODES}")
+
+    ttl = float(ttl_env) * 24 * 3600 if ttl_env else 30 * 24 * 3600
+    max_entries = int(max_entries_env) if max_entries_env else 200_000
+
+    return SenseCache(path, ttl=ttl if ttl > 0 else None,
+                      max_entries=max_entries if max_entries > 0 else None,
+                      mode=mode)
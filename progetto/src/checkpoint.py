@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+
+def journal_key(words: Tuple[str, ...], langs: List[str]) -> str:
+    return json.dumps([list(words), [lang.upper() for lang in langs]], ensure_ascii=False)
+
+
+def entry_matches(entry: Dict[str, Any], langs: List[str], expand: bool) -> bool:
+    # Entries written before the mode was journaled come from the default mode
+    return (entry.get('langs') == [lang.upper() for lang in langs]
+            and entry.get('expand', False) == expand)
+
+
+def read_journal(filename: str) -> Iterator[Dict[str, Any]]:
+    if not os.path.exists(filename):
+        return
+    with open(filename, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring truncated checkpoint line {line_number} "
+                                f"in {filename}")
+
+
+def drop_unsaved(filename: str, langs: List[str], expand: bool, saved: Set[str]) -> int:
+    # Journaled tuples whose sense rows never reached disk are fetched again
+    if not os.path.exists(filename):
+        return 0
+    kept = []
+    dropped = 0
+    for entry in read_journal(filename):
+        if (entry_matches(entry, langs, expand) and any(entry.get('synsets', {}).values())
+                and entry.get('pseudoword') not in saved):
+            dropped += 1
+        else:
+            kept.append(entry)
+    if not dropped:
+        return 0
+
+    partial = f'{filename}.partial'
+    with open(partial, 'w', encoding='utf-8') as file:
+        for entry in kept:
+            file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(partial, filename)
+    logging.warning(f"{dropped} journaled tuples have no sense rows on disk, "
+                    f"they will be fetched again")
+    return dropped
+
+
+class CheckpointJournal:
+    def __init__(self, filename: str = 'rsrc/checkpoint.jsonl', resume: bool = False,
+                 expand: bool = False) -> None:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filename = filename
+        self.expand = expand
+        self.completed: Set[str] = set()
+        self.skipped = 0
+
+        if resume:
+            other_mode = 0
+            for entry in read_journal(filename):
+                if entry.get('expand', False) != expand:
+                    other_mode += 1
+                    continue
+                self.completed.add(journal_key(tuple(entry['words']), entry['langs']))
+            if other_mode:
+                logging.warning(f"Ignoring {other_mode} journaled tuples fetched "
+                                f"{'without' if expand else 'with'} --expand")
+            logging.info(f"Resuming: {len(self.completed)} tuples already journaled "
+                         f"in {filename}")
+            self._file = open(filename, 'a', encoding='utf-8')
+        else:
+            self._file = open(filename, 'w', encoding='utf-8')
+
+    def is_done(self, words: Tuple[str, ...], langs: List[str]) -> bool:
+        return journal_key(words, langs) in self.completed
+
+    def pending(self, word_tuples: Iterator[Tuple[str, ...]], langs: List[str]
+                ) -> Iterator[Tuple[str, ...]]:
+        for words in word_tuples:
+            if self.is_done(words, langs):
+                self.skipped += 1
+                continue
+            yield words
+
+    def record(self, words: Tuple[str, ...], langs: List[str], result: Dict[str, Any]
+               ) -> None:
+        entry = {'words': list(words), 'langs': [lang.upper() for lang in langs],
+                 'expand': self.expand}
+        entry.update(result)
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.completed.add(journal_key(words, langs))
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def __enter__(self) -> 'CheckpointJournal':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from src.babelnet import BABELNET_URL, build_params, is_error_payload
+from src.cache import SenseCache, make_cache_key
+from src.senses import SenseIndex
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def block(self, seconds: float) -> None:
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+
+
+class BabelNetClient:
+    def __init__(
+        self,
+        key: Optional[str],
+        cache: Optional[SenseCache] = None,
+        concurrency: int = 8,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+        quota: Optional[int] = None,
+        url: str = BABELNET_URL,
+        memo_size: int = 100_000
+    ) -> None:
+        self.key = key
+        self.cache = cache
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.quota = quota
+        self.url = url
+        self.memo_size = memo_size
+        self.requests_sent = 0
+        self.retries = 0
+        self.deduplicated = 0
+        self.memo_hits = 0
+        self._pending: Dict[Tuple[Any, ...], 'asyncio.Task[Any]'] = {}
+        self._memo: 'OrderedDict[Tuple[str, str], Optional[SenseIndex]]' = OrderedDict()
+        self._bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'BabelNetClient':
+        connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                         ttl_dns_cache=300,
+                                         keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for task in list(self._pending.values()):
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return float(retry_after) + random.uniform(0, self.backoff)
+            except ValueError:
+                pass
+        ceiling = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def get_sense(
+        self,
+        lemma: str,
+        targetLang: List[str],
+        source: str = "WIKI"
+    ) -> Optional[List[Dict[str, Any]]]:
+        # Concurrent lookups of the same query share a single request
+        key = (lemma, targetLang[0].upper(),
+               tuple(sorted({lang.upper() for lang in targetLang})), source.upper())
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get_sense(lemma, targetLang, source))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    async def get_sense_index(self, lemma: str, lang: str) -> Optional[SenseIndex]:
+        key = (lemma, lang.upper())
+        if key in self._memo:
+            self.memo_hits += 1
+            self._memo.move_to_end(key)
+            return self._memo[key]
+
+        senses = await self.get_sense(lemma, [lang.upper()])
+        index = SenseIndex.from_response(senses) if senses else None
+        if senses is None:
+            # A failed lookup is not remembered, later tuples may still succeed
+            return None
+        self._memo[key] = index
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return index
+
+    async def _get_sense(
+        self,
+        lemma: str,
+        targetLang: List[str],
+        source: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        searchLang = targetLang[0]
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = make_cache_key(lemma, searchLang, targetLang, source)
+            # SQLite calls block, so they run off the event loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+            if self.cache.offline:
+                logging.warning(f"Offline mode: no cached senses for '{lemma}'")
+                return None
+
+        senses = await self._fetch(build_params(lemma, targetLang, self.key, source))
+        if senses is not None and self.cache is not None:
+            await asyncio.to_thread(self.cache.put, cache_key, senses)
+        return senses
+
+    async def _fetch(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        if self._session is None:
+            raise RuntimeError("BabelNetClient must be used as an async context manager")
+
+        lemma = params['lemma']
+        query = to_query(params)
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                if self.quota is not None and self.requests_sent >= self.quota:
+                    raise QuotaExceeded(f"BabelNet request quota of {self.quota} reached")
+
+                await self._bucket.acquire()
+                self.requests_sent += 1
+                retry_after = None
+                try:
+                    async with self._session.get(self.url, params=query) as response:
+                        if response.status in RETRY_STATUSES:
+                            retry_after = response.headers.get('Retry-After')
+                            reason = f"HTTP {response.status}"
+                        else:
+                            response.raise_for_status()
+                            data = await response.json(content_type=None)
+                            if is_error_payload(data):
+                                logging.error(f"BabelNet refused '{lemma}': "
+                                              f"{data.get('message')}")
+                                return None
+                            return data
+                except aiohttp.ClientResponseError as e:
+                    logging.error(f"Error fetching synsets for '{lemma}': {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    reason = f"{type(e).__name__}: {e}"
+
+                if attempt == self.max_retries:
+                    logging.error(f"Giving up on '{lemma}' after "
+                                  f"{attempt + 1} attempts ({reason})")
+                    return None
+
+                delay = self._delay(attempt, retry_after)
+                if retry_after is not None:
+                    self._bucket.block(delay)
+                self.retries += 1
+                logging.warning(f"Retrying '{lemma}' in {delay:.2f}s ({reason})")
+                await asyncio.sleep(delay)
+        return None
+
+
+def to_query(params: Dict[str, Any]) -> List[Tuple[str, str]]:
+    query = []
+    for name, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((name, str(v)) for v in values if v is not None)
+    return query
+
+
+def client_from_env(key: Optional[str], cache: Optional[SenseCache] = None
+                    ) -> BabelNetClient:
+    quota_env = os.getenv('BABELNET_QUOTA')
+    return BabelNetClient(
+        key,
+        cache=cache,
+        concurrency=int(os.getenv('BABELNET_CONCURRENCY', '8')),
+        rate=float(os.getenv('BABELNET_RATE', '5')),
+        max_retries=int(os.getenv('BABELNET_MAX_RETRIES', '5')),
+        quota=int(quota_env) if quota_env else None,
+        url=os.getenv('BABELNET_URL', BABELNET_URL),
+        memo_size=int(os.getenv('BABELNET_MEMO_SIZE', '100000'))
+    )
@@ -0,0 +1,50 @@
+import asyncio
+from typing import (AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple,
+                    TypeVar)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+async def stream_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    limit: int
+) -> AsyncIterator[Tuple[T, R]]:
+    if limit < 1:
+        raise ValueError("stream_map needs at least one task in flight")
+
+    iterator = iter(items)
+    pending: Dict['asyncio.Future[R]', T] = {}
+
+    def fill() -> None:
+        while len(pending) < limit:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            pending[asyncio.ensure_future(func(item))] = item
+
+    error: Optional[BaseException] = None
+    fill()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                if task.cancelled():
+                    error = error or asyncio.CancelledError()
+                    continue
+                if task.exception() is not None:
+                    error = error or task.exception()
+                    continue
+                yield item, task.result()
+            if error is None:
+                fill()
+        if error is not None:
+            raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,126 @@
+import csv
+import logging
+import os
+import time
+from typing import List, Sequence
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from src.scoring import SubsetScores  # noqa: E402
+
+ECDF_POINTS = 2000
+
+
+def plot_distribution(scores: np.ndarray, filename: str, bins: int = 50) -> None:
+    fig, (hist_ax, ecdf_ax) = plt.subplots(1, 2, figsize=(12, 5))
+
+    counts, edges = np.histogram(scores, bins=bins, range=(0.0, 1.0))
+    hist_ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color=plt.cm.viridis(0.4))
+    hist_ax.set_xlabel('Ambiguity Reduction Score')
+    hist_ax.set_ylabel('Pseudowords')
+    hist_ax.set_title('Score distribution')
+
+    # The ECDF is sampled at a fixed number of quantiles, whatever the input size
+    quantiles = np.linspace(0.0, 1.0, min(ECDF_POINTS, len(scores)))
+    ecdf_ax.plot(np.quantile(scores, quantiles), quantiles,
+                 drawstyle='steps-post', color=plt.cm.viridis(0.7))
+    ecdf_ax.set_xlabel('Ambiguity Reduction Score')
+    ecdf_ax.set_ylabel('Fraction of pseudowords')
+    ecdf_ax.set_title('Empirical CDF')
+    ecdf_ax.set_xlim(0.0, 1.0)
+
+    fig.suptitle(f'Pseudoword Ambiguity Reduction ({len(scores)} pseudowords, '
+                 f'mean {scores.mean():.3f}, median {np.median(scores):.3f})')
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+
+def plot_extremes(pseudowords: Sequence[str], scores: np.ndarray, filename: str,
+                  top_k: int = 25) -> None:
+    if len(scores) <= 2 * top_k:
+        groups = [('All pseudowords', np.argsort(scores))]
+    else:
+        top = np.argpartition(scores, -top_k)[-top_k:]
+        bottom = np.argpartition(scores, top_k)[:top_k]
+        groups = [(f'Bottom {top_k}', bottom[np.argsort(scores[bottom])]),
+                  (f'Top {top_k}', top[np.argsort(scores[top])])]
+
+    fig, axes = plt.subplots(1, len(groups), figsize=(7 * len(groups), 0.3 * top_k + 2),
+                             squeeze=False)
+    for ax, (title, indices) in zip(axes[0], groups):
+        values = scores[indices]
+        y_pos = np.arange(len(indices))
+        bars = ax.barh(y_pos, values, color=plt.cm.viridis(values))
+        ax.set_yticks(y_pos, [pseudowords[i] for i in indices], fontsize=8)
+        ax.bar_label(bars, fmt='%.2f', fontsize=7, padding=2)
+        ax.set_xlim(0.0, 1.1)
+        ax.set_xlabel('Ambiguity Reduction Score')
+        ax.set_title(title)
+
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+
+def aggregate_by_languages(results: Sequence[SubsetScores], filename: str) -> List[dict]:
+    rows = []
+    for result in results:
+        scores = result.scores
+        rows.append({
+            'languages': '/'.join(result.langs),
+            'count': len(scores),
+            'mean': float(scores.mean()) if len(scores) else 0.0,
+            'median': float(np.median(scores)) if len(scores) else 0.0,
+            'std': float(scores.std()) if len(scores) else 0.0,
+            'mean_common': float(result.common.mean()) if len(scores) else 0.0,
+        })
+
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else ['languages'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def plot_by_languages(rows: Sequence[dict], filename: str) -> None:
+    fig, ax = plt.subplots(figsize=(max(6, 0.8 * len(rows) + 2), 5))
+    x_pos = np.arange(len(rows))
+    ax.bar(x_pos, [row['mean'] for row in rows], yerr=[row['std'] for row in rows],
+           color=plt.cm.viridis(np.linspace(0, 1, len(rows))), capsize=3)
+    ax.set_xticks(x_pos, [row['languages'] for row in rows], rotation=45, ha='right')
+    ax.set_ylabel('Mean Ambiguity Reduction Score')
+    ax.set_title('Ambiguity reduction by language combination')
+    fig.tight_layout()
+    fig.savefig(filename)
+    plt.close(fig)
+
+
+def write_report(
+    pseudowords: Sequence[str],
+    scores: np.ndarray,
+    subset_results: Sequence[SubsetScores] = (),
+    output_dir: str = 'rsrc/report',
+    top_k: int = 25
+) -> None:
+    if not len(scores):
+        logging.warning("No data available for plotting.")
+        return
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+
+    plot_distribution(scores, os.path.join(output_dir, 'score_distribution.png'))
+    plot_extremes(pseudowords, scores, os.path.join(output_dir, 'top_bottom.png'), top_k)
+
+    if subset_results:
+        rows = aggregate_by_languages(subset_results,
+                                      os.path.join(output_dir, 'by_languages.csv'))
+        plot_by_languages(rows, os.path.join(output_dir, 'by_languages.png'))
+
+    logging.info(f"Saved report for {len(scores)} pseudowords to {output_dir} "
+                 f"in {time.perf_counter() - start:.2f}s")
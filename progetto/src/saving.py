@@ -1,64 +1,223 @@
-import csv
+import glob
 import json
-from typing import List, Set, Dict, Any
+import logging
+import os
+from typing import Any, Dict, List, Sequence, Set, Tuple
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-def extract_lemma_for_lang(
-    synsets: List[Dict[str, Any]],
-    synset_id: str,
-    lang: str
-) -> str:
-    for synset in synsets:
-        props = synset.get('properties', {})
-        sid = props.get('synsetID', {}).get('id')
-        language = props.get('language', '').upper()
-        if sid == synset_id and language == lang.upper():
-            return props.get('fullLemma') or props.get('simpleLemma') or "N/A"
-    return "N/A"
+from src.scoring import SubsetScores
+from src.senses import SenseIndex
+
+PSEUDOWORD_SCHEMA = pa.schema([
+    ('pseudoword', pa.string()),
+    ('language', pa.string()),
+    ('word', pa.string()),
+    ('sense', pa.string()),
+    ('synset_id', pa.string()),
+    ('is_common', pa.bool_()),
+])
+
+
+class PseudowordStore:
+    def __init__(
+        self,
+        directory: str = 'rsrc/pseudowords',
+        batch_size: int = 50_000,
+        append: bool = False,
+        overwrite: bool = False
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        parts = sorted(glob.glob(os.path.join(directory, 'part-*.parquet')))
+        if parts and not append:
+            if not overwrite:
+                raise FileExistsError(f"{directory} already holds {len(parts)} "
+                                      f"part files from a previous run")
+            for part in parts:
+                os.remove(part)
+            logging.info(f"Removed {len(parts)} part files from {directory}")
+            parts = []
+
+        for partial in glob.glob(os.path.join(directory, '_partial-*.parquet')):
+            os.remove(partial)
+
+        self.directory = directory
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.parts_written = 0
+        # Pseudowords whose rows earlier runs already saved, they are not written again
+        self.saved: Set[str] = set()
+        self._next_part = len(parts)
+        self._columns: Dict[str, List[Any]] = {name: [] for name in PSEUDOWORD_SCHEMA.names}
+        for part in parts:
+            self._load_part(part)
+
+    def _load_part(self, part: str) -> None:
+        # A part without a footer was cut short by a hard kill, readers skip '_' files
+        try:
+            table = pq.read_table(part, columns=['pseudoword'])
+        except (pa.ArrowInvalid, OSError) as e:
+            broken = os.path.join(self.directory, '_broken-' + os.path.basename(part))
+            os.replace(part, broken)
+            logging.warning(f"Moved unreadable {part} to {broken}: {e}")
+            return
+        self.saved.update(table.column('pseudoword').unique().to_pylist())
+
+    def add(self, pseudoword: str, language: str, word: str, sense: str,
+            synset_id: str, is_common: bool) -> None:
+        columns = self._columns
+        columns['pseudoword'].append(pseudoword)
+        columns['language'].append(language)
+        columns['word'].append(word)
+        columns['sense'].append(sense)
+        columns['synset_id'].append(synset_id)
+        columns['is_common'].append(is_common)
+
+    def flush_if_full(self) -> None:
+        # Called between pseudowords, so the rows of one never span two parts
+        if len(self._columns['pseudoword']) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        buffered = len(self._columns['pseudoword'])
+        if not buffered:
+            return
+        # Each batch is a complete part file, renamed into place once its footer is written
+        filename = os.path.join(self.directory, f'part-{self._next_part:05d}.parquet')
+        partial = os.path.join(self.directory, f'_partial-{self._next_part:05d}.parquet')
+        table = pa.Table.from_pydict(self._columns, schema=PSEUDOWORD_SCHEMA)
+        pq.write_table(table, partial, compression='zstd')
+        os.replace(partial, filename)
+        self._next_part += 1
+        self.parts_written += 1
+        self.rows_written += buffered
+        self._columns = {name: [] for name in PSEUDOWORD_SCHEMA.names}
+
+    def close(self) -> None:
+        self.flush()
+        logging.info(f"Saved {self.rows_written} sense rows to {self.parts_written} "
+                     f"part files in {self.directory}")
+
+    def __enter__(self) -> 'PseudowordStore':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 def save_pseudoword(
-    en_word: str,
-    it_word: str,
-    synsets: List[Dict[str, Any]],
-    common_synsets: Set[str]
+    pseudoword: str,
+    words: Sequence[str],
+    langs: Sequence[str],
+    index: SenseIndex,
+    common_synsets: Set[str],
+    store: PseudowordStore
+) -> None:
+    if pseudoword in store.saved:
+        return
+    langs = [lang.upper() for lang in langs]
+
+    # Save language-exclusive senses
+    for word, lang in zip(words, langs):
+        for synset_id in index.synsets_for(lang) - common_synsets:
+            store.add(pseudoword, lang, word, index.lemma(synset_id, lang),
+                      synset_id, False)
+
+    # Save common senses
+    common_language = '/'.join(langs)
+    common_word = '/'.join(words)
+    for synset_id in common_synsets:
+        sense = '/'.join(index.lemma(synset_id, lang) for lang in langs)
+        store.add(pseudoword, common_language, common_word, sense, synset_id, True)
+    store.flush_if_full()
+
+
+SUBSET_SCORE_SCHEMA = pa.schema([
+    ('pseudoword', pa.string()),
+    ('languages', pa.string()),
+    ('total', pa.int32()),
+    ('common', pa.int32()),
+    ('ambiguity_reduction', pa.float64()),
+])
+
+
+def save_subset_scores(
+    pseudowords: Sequence[str],
+    results: Sequence[SubsetScores],
+    filename: str = 'rsrc/rescored_ambiguities.parquet'
 ) -> None:
-    filename = f'rsrc/pseudowords_{en_word}_{it_word}.csv'
-
-    # Extract all synsets for each language
-    en_synsets = {s['properties']['synsetID']['id'] for s in synsets
-                  if s['properties']['language'].upper() == 'EN'}
-    it_synsets = {s['properties']['synsetID']['id'] for s in synsets
-                  if s['properties']['language'].upper() == 'IT'}
-
-    with open(filename, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.writer(file)
-        writer.writerow(['pseudoword', 'language', 'word',
-                        'sense', 'synset_id', 'is_common'])
-
-        # Save English-exclusive senses
-        for synset_id in en_synsets - common_synsets:
-            sense = extract_lemma_for_lang(synsets, synset_id, 'EN')
-            writer.writerow([f"{en_word}-{it_word}", 'EN', en_word,
-                             sense, synset_id, False])
-
-        # Save Italian-exclusive senses
-        for synset_id in it_synsets - common_synsets:
-            sense = extract_lemma_for_lang(synsets, synset_id, 'IT')
-            writer.writerow([f"{en_word}-{it_word}", 'IT', it_word,
-                             sense, synset_id, False])
-
-        # Save common senses
-        for synset_id in common_synsets:
-            en_sense = extract_lemma_for_lang(synsets, synset_id, 'EN')
-            it_sense = extract_lemma_for_lang(synsets, synset_id, 'IT')
-            writer.writerow([f"{en_word}-{it_word}", 'BOTH', f"{en_word}/{it_word}",
-                             f"{en_sense}/{it_sense}", synset_id, True])
+    pseudoword_column = pa.array(pseudowords, type=pa.string())
+    with pq.ParquetWriter(filename, SUBSET_SCORE_SCHEMA, compression='zstd') as writer:
+        for result in results:
+            languages = '/'.join(result.langs)
+            writer.write_table(pa.Table.from_arrays([
+                pseudoword_column,
+                pa.array([languages] * len(pseudowords), type=pa.string()),
+                pa.array(result.sizes.sum(axis=1), type=pa.int32()),
+                pa.array(result.common, type=pa.int32()),
+                pa.array(result.scores, type=pa.float64()),
+            ], schema=SUBSET_SCORE_SCHEMA))
+    logging.info(f"Saved {len(results)} language subsets for {len(pseudowords)} "
+                 f"pseudowords to {filename}")
+
+
+SCORES_FILE = 'rsrc/ambiguity_scores.jsonl'
+AMBIGUITIES_FILE = 'rsrc/ambiguity_scores.parquet'
+
+SCORE_SCHEMA = pa.schema([
+    ('pseudoword', pa.string()),
+    ('ambiguity_reduction', pa.float32()),
+])
 
 
 def save_ambiguities(
-    data: List[Dict[str, Any]],
-    filename: str = 'rsrc/ambiguity_scores.json'
+    pseudowords: Sequence[str],
+    scores: np.ndarray,
+    filename: str = AMBIGUITIES_FILE
 ) -> None:
-    with open(filename, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+    table = pa.Table.from_arrays([
+        pa.array(pseudowords, type=pa.string()),
+        pa.array(scores, type=pa.float32()),
+    ], schema=SCORE_SCHEMA)
+    pq.write_table(table, filename, compression='zstd')
+
+
+class ScoreWriter:
+    def __init__(self, filename: str = SCORES_FILE) -> None:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.filename = filename
+        self.count = 0
+        self._file = open(filename, 'w', encoding='utf-8')
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'ScoreWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def load_ambiguities(filename: str = SCORES_FILE
+                     ) -> Tuple[List[str], np.ndarray]:
+    pseudowords = []
+    scores = []
+    if os.path.exists(filename):
+        with open(filename, encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                pseudowords.append(entry['pseudoword'])
+                scores.append(entry['ambiguity_reduction'])
+    return pseudowords, np.asarray(scores, dtype=np.float64)
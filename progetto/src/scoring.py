@@ -0,0 +1,80 @@
+import itertools
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+@dataclass(slots=True)
+class SubsetScores:
+    langs: Tuple[str, ...]
+    sizes: np.ndarray
+    common: np.ndarray
+    scores: np.ndarray
+
+
+def encode_synsets(
+    entries: Sequence[Mapping[str, Sequence[str]]],
+    langs: Sequence[str]
+) -> Tuple[Dict[str, sparse.csr_matrix], Dict[str, int]]:
+    codes: Dict[str, int] = {}
+    indptr: Dict[str, List[int]] = {lang: [0] for lang in langs}
+    indices: Dict[str, List[int]] = {lang: [] for lang in langs}
+
+    for entry in entries:
+        for lang in langs:
+            lang_indices = indices[lang]
+            lang_indices.extend(codes.setdefault(synset_id, len(codes))
+                                for synset_id in entry.get(lang, ()))
+            indptr[lang].append(len(lang_indices))
+
+    shape = (len(entries), len(codes))
+    matrices = {}
+    for lang in langs:
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices[lang]), dtype=np.uint8),
+             np.asarray(indices[lang], dtype=np.int64),
+             np.asarray(indptr[lang], dtype=np.int64)),
+            shape=shape
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        matrices[lang] = matrix
+    return matrices, codes
+
+
+def reduction_scores(sizes: np.ndarray, common: np.ndarray) -> np.ndarray:
+    total = sizes.sum(axis=1)
+    langs_len = sizes.shape[1]
+    scores = np.zeros(len(total), dtype=np.float64)
+    nonzero = total > 0
+    scores[nonzero] = (total[nonzero] - common[nonzero] * langs_len) / total[nonzero]
+    return scores
+
+
+def score_subsets(
+    matrices: Mapping[str, sparse.csr_matrix],
+    langs: Sequence[str],
+    min_size: int = 2
+) -> List[SubsetScores]:
+    sizes = {lang: np.asarray(matrices[lang].getnnz(axis=1)) for lang in langs}
+    results = []
+
+    # Intersections of size r are built from the cached ones of size r - 1
+    previous: Dict[Tuple[str, ...], sparse.csr_matrix] = {
+        (lang,): matrices[lang] for lang in langs}
+    for size in range(2, len(langs) + 1):
+        current = {}
+        for subset in itertools.combinations(langs, size):
+            current[subset] = previous[subset[:-1]].multiply(matrices[subset[-1]]).tocsr()
+        previous = current
+
+        if size < min_size:
+            continue
+        for subset, intersection in current.items():
+            subset_sizes = np.column_stack([sizes[lang] for lang in subset])
+            common = np.asarray(intersection.getnnz(axis=1))
+            results.append(SubsetScores(subset, subset_sizes, common,
+                                        reduction_scores(subset_sizes, common)))
+    return results
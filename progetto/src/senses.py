@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class Sense:
+    synset_id: str
+    language: str
+    lemma: str
+
+
+class SenseIndex:
+    __slots__ = ('by_key', 'by_lang')
+
+    def __init__(self, senses: Iterable[Sense]) -> None:
+        self.by_key: Dict[Tuple[str, str], Sense] = {}
+        self.by_lang: Dict[str, Set[str]] = {}
+        for sense in senses:
+            key = (sense.synset_id, sense.language)
+            if key not in self.by_key:
+                self.by_key[key] = sense
+                self.by_lang.setdefault(sense.language, set()).add(sense.synset_id)
+
+    @classmethod
+    def from_response(cls, synsets: List[Dict[str, Any]]) -> 'SenseIndex':
+        return cls(sense for sense in map(parse_sense, synsets) if sense is not None)
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def languages(self) -> List[str]:
+        return list(self.by_lang)
+
+    def synsets_for(self, lang: str) -> Set[str]:
+        return self.by_lang.get(lang.upper(), set())
+
+    def lemma(self, synset_id: str, lang: str, default: str = 'N/A') -> str:
+        sense = self.by_key.get((synset_id, lang.upper()))
+        if sense is None or not sense.lemma:
+            return default
+        return sense.lemma
+
+
+def parse_sense(synset: Dict[str, Any]) -> Optional[Sense]:
+    props = synset.get('properties', {})
+    synset_id = props.get('synsetID', {}).get('id')
+    lang = props.get('language', '').upper()
+    if not synset_id or not lang:
+        return None
+    lemma = props.get('fullLemma') or props.get('simpleLemma') or ''
+    return Sense(synset_id, lang, lemma)
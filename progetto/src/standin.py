@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from src.cache import SenseCache, make_cache_key
+
+
+@dataclass(slots=True)
+class StandInConfig:
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    quota: Optional[int] = None
+    senses_per_lang: int = 8
+    synset_pool: int = 50_000
+    recordings: Optional[str] = None
+
+
+def synthetic_senses(lemma: str, langs: List[str], senses_per_lang: int,
+                     synset_pool: int) -> List[Dict[str, Any]]:
+    seed = int.from_bytes(hashlib.sha1(lemma.encode('utf-8')).digest()[:8], 'big')
+    rng = random.Random(seed)
+    shared = rng.sample(range(synset_pool), senses_per_lang)
+    senses = []
+    for lang in langs:
+        for number in shared:
+            if rng.random() < 0.3:
+                number = rng.randrange(synset_pool)
+            senses.append({
+                'type': 'BabelSense',
+                'properties': {
+                    'fullLemma': f'{lemma}_{lang.lower()}',
+                    'simpleLemma': lemma,
+                    'source': 'WIKI',
+                    'language': lang,
+                    'synsetID': {'id': f'bn:{number:08d}n', 'pos': 'NOUN',
+                                 'source': 'BABELNET'},
+                }
+            })
+    return senses
+
+
+def create_app(config: StandInConfig) -> web.Application:
+    recordings = (SenseCache(config.recordings, ttl=None, max_entries=None,
+                             mode='readonly')
+                  if config.recordings else None)
+    state = {'served': 0, 'tokens': config.rate_limit or 0.0,
+             'updated': time.monotonic()}
+
+    def over_rate_limit() -> bool:
+        if not config.rate_limit:
+            return False
+        now = time.monotonic()
+        state['tokens'] = min(config.rate_limit, state['tokens'] +
+                              (now - state['updated']) * config.rate_limit)
+        state['updated'] = now
+        if state['tokens'] < 1:
+            return True
+        state['tokens'] -= 1
+        return False
+
+    async def get_senses(request: web.Request) -> web.Response:
+        delay = max(0.0, random.gauss(config.latency, config.jitter))
+        await asyncio.sleep(delay)
+
+        if over_rate_limit():
+            return web.Response(status=429, headers={'Retry-After': '1'})
+        if random.random() < config.error_rate:
+            return web.Response(status=random.choice((500, 502, 503)))
+
+        state['served'] += 1
+        if config.quota is not None and state['served'] > config.quota:
+            return web.json_response({
+                'message': 'Your key is not valid or the daily requests limit '
+                           'has been reached.'
+            })
+
+        lemma = request.query.get('lemma', '')
+        langs = [lang.upper() for lang in request.query.getall('targetLang', [])]
+        search_lang = request.query.get('searchLang', langs[0] if langs else 'EN')
+        source = request.query.get('source', 'WIKI')
+
+        if recordings is not None:
+            recorded = recordings.get(make_cache_key(lemma, search_lang, langs, source))
+            if recorded is not None:
+                return web.json_response(recorded)
+
+        return web.json_response(synthetic_senses(
+            lemma, langs, config.senses_per_lang, config.synset_pool))
+
+    app = web.Application()
+    app.router.add_get('/v9/getSenses', get_senses)
+    return app
+
+
+def serve(config: StandInConfig, host: str = '127.0.0.1', port: int = 8765) -> None:
+    logging.info(f"BabelNet stand-in listening on http://{host}:{port}/v9/getSenses")
+    web.run_app(create_app(config), host=host, port=port, print=None,
+                access_log=None)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline BabelNet getSenses stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02,
+                        help='Standard deviation of the response latency')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Probability of answering with a 5xx error')
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help='Requests per second before answering 429')
+    parser.add_argument('--quota', type=int, default=None,
+                        help='Requests served before the daily limit message')
+    parser.add_argument('--recordings', default=None,
+                        help='SenseCache file whose responses are replayed')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    serve(StandInConfig(latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate_limit=args.rate_limit,
+                        quota=args.quota, recordings=args.recordings),
+          host=args.host, port=args.port)